@@ -0,0 +1,302 @@
+"""
+Framework overhead benchmarks for testamaton.
+
+Synthetic suites of empty tests are generated in memory, so every measured
+microsecond is spent in testamaton itself: registering tests (collect),
+sequential dispatch through ``Runner`` (dispatch), concurrent dispatch
+through the resource scheduler (schedule) and rendering results with the
+reporter (report). Results are stored per version in ``benchmarks/results``
+(git-ignored, ``--results-dir`` picks another directory) and compared with
+earlier runs::
+
+    python benchmarks/bench_runner.py --sizes 1000,10000,100000
+    python benchmarks/bench_runner.py --sizes 1000000 --phase dispatch
+    python benchmarks/bench_runner.py --compare
+"""
+
+import gc
+import io
+import json
+import os
+import platform
+import subprocess
+from importlib import metadata
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Optional
+
+import click
+from rich import box
+from rich.table import Table
+
+from testamaton import reporter
+from testamaton.reporter import TestResult, print_test_result
+from testamaton.sessions import Runner
+from testamaton.standard import Argument
+from testamaton.test_case import TestCase, expect
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+KINDS = ("sync", "async", "param", "fail")
+PHASES = ("collect", "dispatch", "schedule", "report")
+PARAMETERS = 10
+FAILURE_OUTPUT = "Traceback (most recent call last):\nTestError: synthetic failure"
+
+
+def _sync() -> None:
+    pass
+
+
+async def _async() -> None:
+    pass
+
+
+def _param(value: int) -> None:
+    pass
+
+
+def _fail() -> None:
+    expect(1, 2, "synthetic failure")
+
+
+BODIES: Dict[str, Callable] = {
+    "sync": _sync,
+    "async": _async,
+    "param": _param,
+    "fail": _fail,
+}
+
+
+def _clone(body: Callable, name: str) -> Callable:
+    """A distinct function object sharing ``body``'s code, named ``name``."""
+    func = type(body)(body.__code__, body.__globals__, name)
+    func.__qualname__ = name
+    return func
+
+
+def build_suite(kind: str, size: int) -> TestCase:
+    """``size`` tests of ``kind``; ``param`` spreads them over argument sets."""
+    case = TestCase(f"bench-{kind}-{size}")
+
+    if kind == "param":
+        arguments = tuple(Argument(args=[value]) for value in range(PARAMETERS))
+        register = case.test(arguments=arguments)
+        count = max(1, size // PARAMETERS)
+    else:
+        register = case.test()
+        count = size
+
+    body = BODIES[kind]
+
+    for index in range(count):
+        register(_clone(body, f"{kind}_{index}"))
+
+    return case
+
+
+def _runner(case: TestCase, concurrency: int) -> Runner:
+    runner = Runner(case.tests, case, concurrency=concurrency)
+    runner.report = lambda result: None
+    return runner
+
+
+def measure(phase: str, kind: str, size: int) -> float:
+    """Seconds spent in ``phase`` for a suite of ``kind`` and ``size``."""
+    if phase == "collect":
+        start = perf_counter()
+        build_suite(kind, size)
+        return perf_counter() - start
+
+    if phase == "report":
+        failed = kind == "fail"
+        results = [
+            TestResult(
+                percent=index * 100 // size,
+                label=f"{kind}_{index}:[line 1]",
+                status="error" if failed else "success",
+                output=FAILURE_OUTPUT if failed else None,
+            )
+            for index in range(size)
+        ]
+        stream, reporter.console.file = reporter.console.file, io.StringIO()
+
+        try:
+            start = perf_counter()
+            for result in results:
+                print_test_result(result)
+            return perf_counter() - start
+        finally:
+            reporter.console.file = stream
+
+    case = build_suite(kind, size)
+    runner = _runner(case, 1 if phase == "dispatch" else 8)
+
+    start = perf_counter()
+    runner.launch_test_chain(live=False)
+    return perf_counter() - start
+
+
+def _version() -> Dict[str, str]:
+    try:
+        version = metadata.version("testamaton")
+    except metadata.PackageNotFoundError:
+        version = "dev"
+
+    try:
+        revision = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        revision = "unknown"
+
+    return {"version": version, "revision": revision}
+
+
+def run_benchmarks(
+    sizes: List[int], kinds: List[str], phases: List[str], repeat: int
+) -> Dict[str, Any]:
+    results: Dict[str, Any] = {
+        **_version(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": [],
+    }
+
+    for size in sizes:
+        for kind in kinds:
+            for phase in phases:
+                timings = []
+
+                for _ in range(repeat):
+                    gc.collect()
+                    timings.append(measure(phase, kind, size))
+
+                best = min(timings)
+                results["results"].append(
+                    {
+                        "phase": phase,
+                        "kind": kind,
+                        "size": size,
+                        "seconds": best,
+                        "per_test_us": best / size * 1e6,
+                    }
+                )
+                click.echo(
+                    f"{phase:>8} {kind:>5} {size:>8}: "
+                    f"{best:9.3f}s {best / size * 1e6:9.2f} us/test",
+                    err=True,
+                )
+
+    return results
+
+
+def save(results: Dict[str, Any], directory: str = RESULTS_DIR) -> str:
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(
+        directory, f"{results['version']}-{results['revision']}.json"
+    )
+
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(results, file, indent=2)
+
+    return path
+
+
+def compare(
+    paths: Optional[List[str]] = None, directory: str = RESULTS_DIR
+) -> None:
+    """Per-test overhead of every stored run, one column per run."""
+    if not paths:
+        paths = sorted(
+            (
+                os.path.join(directory, name)
+                for name in os.listdir(directory)
+                if name.endswith(".json")
+            ),
+            key=os.path.getmtime,
+        )
+
+    runs = []
+    for path in paths:
+        with open(path, encoding="utf-8") as file:
+            runs.append(json.load(file))
+
+    table = Table(title="us per test", box=box.ROUNDED)
+    table.add_column("phase / kind / size", style="cyan")
+
+    for run in runs:
+        table.add_column(f"{run['version']} {run['revision']}", justify="right")
+
+    keys = sorted(
+        {
+            (row["phase"], row["kind"], row["size"])
+            for run in runs
+            for row in run["results"]
+        },
+        key=lambda key: (PHASES.index(key[0]), KINDS.index(key[1]), key[2]),
+    )
+
+    for key in keys:
+        cells = []
+
+        for run in runs:
+            row = next(
+                (
+                    row
+                    for row in run["results"]
+                    if (row["phase"], row["kind"], row["size"]) == key
+                ),
+                None,
+            )
+            cells.append(f"{row['per_test_us']:.2f}" if row else "-")
+
+        table.add_row(" / ".join(map(str, key)), *cells)
+
+    reporter.console.print(table)
+
+
+def _split(value: str) -> List[str]:
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+@click.command()
+@click.option("--sizes", default="1000", show_default=True, help="Comma separated.")
+@click.option("--kind", "kinds", multiple=True, type=click.Choice(KINDS))
+@click.option("--phase", "phases", multiple=True, type=click.Choice(PHASES))
+@click.option("--repeat", default=3, show_default=True, help="Best of N runs.")
+@click.option("--no-save", is_flag=True, help="Do not store the results.")
+@click.option("--compare", "show", is_flag=True, help="Compare stored results.")
+@click.option(
+    "--results-dir",
+    default=RESULTS_DIR,
+    show_default=True,
+    help="Directory the results are stored in and compared from.",
+)
+def main(
+    sizes: str,
+    kinds: List[str],
+    phases: List[str],
+    repeat: int,
+    no_save: bool,
+    show: bool,
+    results_dir: str,
+) -> None:
+    if show:
+        compare(directory=results_dir)
+        return
+
+    results = run_benchmarks(
+        [int(size) for size in _split(sizes)],
+        list(kinds) or list(KINDS),
+        list(phases) or list(PHASES),
+        repeat,
+    )
+
+    if not no_save:
+        click.echo(f"saved {save(results, results_dir)}", err=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+import asyncio
+import time
+
+from testamaton.test_case import TestCase, expect
+
+concurrentcase = TestCase()
+concurrentcase.resource("db", capacity=2)
+
+active = {"db": 0, "ports": 0}
+
+
+async def hold(resource: str) -> int:
+    active[resource] += 1
+    peak = active[resource]
+    await asyncio.sleep(0.05)
+    active[resource] -= 1
+    return peak
+
+
+@concurrentcase.test(comment="db group, capacity 2", resources=["db"])
+async def example_db1():
+    expect(await hold("db") <= 2, True, "db capacity exceeded")
+
+
+@concurrentcase.test(comment="db group, capacity 2", resources=["db"])
+async def example_db2():
+    expect(await hold("db") <= 2, True, "db capacity exceeded")
+
+
+@concurrentcase.test(comment="db group, capacity 2", resources=["db"])
+async def example_db3():
+    expect(await hold("db") <= 2, True, "db capacity exceeded")
+
+
+@concurrentcase.test(comment="exclusive port range", resources={"ports": 1})
+async def example_ports1():
+    expect(await hold("ports"), 1, "port range is exclusive")
+
+
+@concurrentcase.test(comment="exclusive port range", resources={"ports": 1})
+async def example_ports2():
+    expect(await hold("ports"), 1, "port range is exclusive")
+
+
+@concurrentcase.test(comment="sync test runs in worker thread")
+def example_sync():
+    time.sleep(0.05)
+
+
+if __name__ == "__main__":
+    concurrentcase.run(concurrency=8)
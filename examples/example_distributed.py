@@ -0,0 +1,35 @@
+import time
+
+from testamaton.standard import Argument
+from testamaton.test_case import TestCase, expect
+
+distcase = TestCase()
+
+
+def fib(n: int) -> int:
+    return n if n < 2 else fib(n - 1) + fib(n - 2)
+
+
+@distcase.test(comment="cpu bound", arguments=(Argument(args=[20]),))
+def example_fib(n: int):
+    expect(fib(n), 6765, "fib(20) should be 6765")
+
+
+@distcase.test(comment="slow io")
+def example_sleep1():
+    time.sleep(0.2)
+
+
+@distcase.test(comment="slow io")
+def example_sleep2():
+    time.sleep(0.2)
+
+
+@distcase.test(comment="output is captured on worker")
+def example_fail():
+    print("printed on worker")
+    expect(1, 2, "this one fails")
+
+
+if __name__ == "__main__":
+    distcase.run_distributed(workers=2)
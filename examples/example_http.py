@@ -0,0 +1,37 @@
+from aiohttp import web
+
+from testamaton.standard import FixtureScope, LoadProfile
+from testamaton.test_case import TestCase, expect
+
+httpcase = TestCase()
+
+
+async def ping(request: web.Request) -> web.Response:
+    return web.json_response({"status": "ok"})
+
+
+@httpcase.fixture(scope=FixtureScope.SESSION)
+def http_app() -> web.Application:
+    app = web.Application()
+    app.router.add_get("/ping", ping)
+    return app
+
+
+@httpcase.test(comment="pooled client against in-process server")
+async def example_http1(http_client, http_server):
+    async with http_client.get(http_server.make_url("/ping")) as response:
+        expect(response.status, 200, "ping should respond with 200")
+        expect(await response.json(), {"status": "ok"}, "ping body mismatch")
+
+
+@httpcase.test(
+    comment="load through shared connection pool",
+    load=LoadProfile(concurrency=20, requests=500, max_error_rate=0.0),
+)
+async def example_http2(http_client, http_server):
+    async with http_client.get(http_server.make_url("/ping")) as response:
+        expect(response.status, 200, "ping should respond with 200")
+
+
+if __name__ == "__main__":
+    httpcase.run()
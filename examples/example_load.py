@@ -0,0 +1,31 @@
+import asyncio
+
+from testamaton.standard import LoadProfile
+from testamaton.test_case import TestCase, expect
+
+loadcase = TestCase()
+
+
+async def handler(value: int) -> int:
+    await asyncio.sleep(0.001)
+    return value * 2
+
+
+@loadcase.test(
+    comment="load with requests limit",
+    load=LoadProfile(concurrency=50, requests=2000, max_error_rate=0.01),
+)
+async def example_load1():
+    expect(await handler(2), 4, "handler should double value")
+
+
+@loadcase.test(
+    comment="load with duration limit",
+    load=LoadProfile(concurrency=20, duration=0.5),
+)
+async def example_load2():
+    expect(await handler(3), 6, "handler should double value")
+
+
+if __name__ == "__main__":
+    loadcase.run()
@@ -0,0 +1,55 @@
+import asyncio
+from time import perf_counter
+
+from testamaton.hooks import Plugin
+from testamaton.test_case import TestCase, expect
+
+plugincase = TestCase()
+
+
+class SlowestTests(Plugin):
+    """Collects durations from results and prints the slowest tests."""
+
+    def __init__(self, top: int = 3) -> None:
+        self.top = top
+        self.durations = {}
+
+    def result(self, result):
+        self.durations[result.label] = result.duration or 0.0
+
+    def report(self, testcase, report):
+        slowest = sorted(self.durations.items(), key=lambda item: -item[1])
+        print(f"Slowest {self.top} tests:")
+        for label, duration in slowest[: self.top]:
+            print(f"  {duration:.3f}s {label}")
+
+
+class SessionTimer(Plugin):
+    def session_start(self, runner):
+        self.started = perf_counter()
+
+    def session_finish(self, runner):
+        print(f"Session took {perf_counter() - self.started:.3f}s")
+
+
+plugincase.plugin(SlowestTests())
+plugincase.plugin(SessionTimer())
+
+
+@plugincase.test()
+async def example_fast():
+    await asyncio.sleep(0.01)
+
+
+@plugincase.test()
+async def example_slow():
+    await asyncio.sleep(0.1)
+
+
+@plugincase.test()
+def example_sync():
+    expect(sum(range(10)), 45, "sum of range(10) should be 45")
+
+
+if __name__ == "__main__":
+    plugincase.run()
@@ -32,4 +32,5 @@ def example_test5():
     assert add(1, 2) == 3
 
 
-firstcase.run()
+if __name__ == "__main__":
+    firstcase.run()
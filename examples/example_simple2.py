@@ -52,4 +52,5 @@ def example_test6():
     return 60
 
 
-firstcase.run()
+if __name__ == "__main__":
+    firstcase.run()
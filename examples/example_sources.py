@@ -0,0 +1,37 @@
+from pathlib import Path
+
+from testamaton.sources import CSVSource, JSONLSource
+from testamaton.test_case import TestCase, expect
+
+sourcecase = TestCase()
+data = Path(__file__).parent / "data"
+
+
+def cubes():
+    for value in range(100):
+        yield value, value**3
+
+
+@sourcecase.test(comment="cases from generator function", arguments=cubes)
+def example_generator(value: int, cube: int):
+    expect(value**3, cube, "cube mismatch")
+
+
+@sourcecase.test(
+    comment="cases streamed from JSONL", arguments=JSONLSource(data / "squares.jsonl")
+)
+def example_jsonl(value: int, square: int):
+    expect(value * value, square, "square mismatch")
+
+
+@sourcecase.test(
+    comment="cases streamed from CSV",
+    arguments=CSVSource(data / "sums.csv", converters={"a": int, "b": int, "total": int}),
+)
+def example_csv(a: int, b: int, total: int):
+    expect(a + b, total, "sum mismatch")
+
+
+if __name__ == "__main__":
+    sourcecase.run()
+    sourcecase.run_distributed(workers=2, chunk_size=4096)
@@ -33,3 +33,10 @@ def test(session):
 def lint(session):
     session.install("ruff")
     session.run("ruff", "check", "src/testamaton/")
+
+
+@nox.session(venv_backend="uv")
+def bench(session):
+    """Measure framework overhead, e.g. ``nox -s bench -- --sizes 1000,100000``."""
+    session.run_always("uv", "pip", "install", ".", external=True)
+    session.run("python", "benchmarks/bench_runner.py", *session.posargs)
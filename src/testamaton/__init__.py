@@ -1,3 +1,10 @@
 from logging import Logger, NullHandler, getLogger
 
 tlogger: Logger = getLogger(__name__).addHandler(NullHandler())
+
+
+def main() -> None:
+    """Entry point of the ``testamaton`` command."""
+    from testamaton.cli import main as cli_main
+
+    cli_main()
@@ -0,0 +1,239 @@
+import io
+import logging
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import IO, Any, Iterator, List, Optional, TextIO
+
+_current_capture: ContextVar[Optional["CaptureBuffer"]] = ContextVar(
+    "testamaton_capture", default=None
+)
+
+
+class CaptureBuffer:
+    """
+    Text buffer that keeps output in memory and spills it to disk.
+
+    Writes beyond ``max_size`` characters are dropped and the buffer is
+    marked as truncated, so a chatty test cannot exhaust memory or disk.
+    """
+
+    def __init__(self, spill_size: int = 1 << 20, max_size: int = 16 << 20) -> None:
+        self.spill_size = spill_size
+        self.max_size = max_size
+        self.size: int = 0
+        self.truncated: bool = False
+        self._memory = io.StringIO()
+        self._disk: Optional[IO[str]] = None
+
+    def write(self, text: str) -> int:
+        length = len(text)
+
+        if self.size + length > self.max_size:
+            text = text[: self.max_size - self.size]
+            self.truncated = True
+
+        if not text:
+            return length
+
+        if self._disk is None and self.size + len(text) > self.spill_size:
+            # Owned by the pooled buffer, closed in close()
+            self._disk = tempfile.TemporaryFile(  # noqa: SIM115
+                "w+", encoding="utf-8"
+            )
+            self._disk.write(self._memory.getvalue())
+            self._memory.seek(0)
+            self._memory.truncate()
+
+        (self._disk or self._memory).write(text)
+        self.size += len(text)
+
+        return length
+
+    def getvalue(self) -> str:
+        if self._disk is None:
+            value = self._memory.getvalue()
+        else:
+            self._disk.seek(0)
+            value = self._disk.read()
+
+        if self.truncated:
+            value += f"\n... output truncated at {self.max_size} characters"
+
+        return value
+
+    def reset(self) -> None:
+        self._memory.seek(0)
+        self._memory.truncate()
+
+        if self._disk is not None:
+            self._disk.close()
+            self._disk = None
+
+        self.size = 0
+        self.truncated = False
+
+
+class ContextStream:
+    """Stream proxy writing into the capture of the current context."""
+
+    def __init__(self, original: TextIO) -> None:
+        self.original = original
+
+    def write(self, text: str) -> int:
+        buffer = _current_capture.get()
+
+        if buffer is None:
+            return self.original.write(text)
+
+        return buffer.write(text)
+
+    def writelines(self, lines: List[str]) -> None:
+        for line in lines:
+            self.write(line)
+
+    def flush(self) -> None:
+        if _current_capture.get() is None:
+            self.original.flush()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.original, name)
+
+
+class CaptureLogHandler(logging.Handler):
+    def emit(self, record: logging.LogRecord) -> None:
+        buffer = _current_capture.get()
+
+        if buffer is not None:
+            try:
+                buffer.write(f"{self.format(record)}\n")
+            except Exception:  # noqa: BLE001 - as logging.Handler.emit does
+                self.handleError(record)
+
+
+class OutputCapture:
+    """
+    Per-test stdout/stderr/logging capture routed through a context variable.
+
+    Every asyncio task and ``asyncio.to_thread`` call copies the context, so
+    concurrent tests on one loop write into their own buffers. Buffers are
+    pooled and reused between tests.
+    """
+
+    def __init__(self, spill_size: int = 1 << 20, max_size: int = 16 << 20) -> None:
+        self.spill_size = spill_size
+        self.max_size = max_size
+        self._pool: List[CaptureBuffer] = []
+        self._handler = CaptureLogHandler()
+        self._handler.setFormatter(
+            logging.Formatter("%(levelname)s %(name)s: %(message)s")
+        )
+        self._stdout: Optional[TextIO] = None
+        self._stderr: Optional[TextIO] = None
+
+    def install(self) -> None:
+        self._stdout, self._stderr = sys.stdout, sys.stderr
+        sys.stdout = ContextStream(self._stdout)
+        sys.stderr = ContextStream(self._stderr)
+        logging.getLogger().addHandler(self._handler)
+
+    def uninstall(self) -> None:
+        logging.getLogger().removeHandler(self._handler)
+
+        if self._stdout is not None:
+            sys.stdout, sys.stderr = self._stdout, self._stderr
+            self._stdout = self._stderr = None
+
+    def start(self) -> Token:
+        buffer = (
+            self._pool.pop()
+            if self._pool
+            else CaptureBuffer(self.spill_size, self.max_size)
+        )
+        return _current_capture.set(buffer)
+
+    def stop(self, token: Token, keep: bool = False) -> Optional[str]:
+        """Detach the current buffer; its contents are only read when ``keep`` is set."""
+        buffer = _current_capture.get()
+        _current_capture.reset(token)
+
+        value = buffer.getvalue() if keep and buffer.size else None
+        buffer.reset()
+        self._pool.append(buffer)
+
+        return value
+
+    @contextmanager
+    def suspended(self) -> Iterator[None]:
+        """Let the current context write to the real streams, e.g. for reports."""
+        token = _current_capture.set(None)
+
+        try:
+            yield
+        finally:
+            _current_capture.reset(token)
+
+
+class FDCapture:
+    """
+    File-descriptor level capture of stdout and stderr.
+
+    Catches output of C extensions and child processes as well, but applies
+    to the whole process, so it is meant for subprocess workers running one
+    test at a time. The backing temporary file is reused between tests.
+    """
+
+    def __init__(self, fds: tuple = (1, 2)) -> None:
+        self.fds = fds
+        self._saved: List[int] = []
+        self._file: Optional[IO[bytes]] = None
+
+    def install(self) -> None:
+        pass
+
+    def uninstall(self) -> None:
+        self.close()
+
+    def start(self) -> None:
+        sys.stdout.flush()
+        sys.stderr.flush()
+
+        if self._file is None:
+            # Reused by every test, closed in close()
+            self._file = tempfile.TemporaryFile()  # noqa: SIM115
+        else:
+            self._file.seek(0)
+            self._file.truncate()
+
+        self._saved = [os.dup(fd) for fd in self.fds]
+
+        for fd in self.fds:
+            os.dup2(self._file.fileno(), fd)
+
+    def stop(self, token: None = None, keep: bool = False) -> Optional[str]:
+        sys.stdout.flush()
+        sys.stderr.flush()
+
+        for fd, saved in zip(self.fds, self._saved, strict=True):
+            os.dup2(saved, fd)
+            os.close(saved)
+
+        self._saved = []
+        value = None
+
+        if keep:
+            self._file.seek(0)
+            value = self._file.read().decode("utf-8", errors="replace") or None
+
+        return value
+
+    @contextmanager
+    def suspended(self) -> Iterator[None]:
+        yield
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -0,0 +1,154 @@
+import sys
+from typing import Optional, Tuple
+
+import click
+
+from testamaton.reporter import (
+    print_duration_trends,
+    print_failure_frequency,
+    print_run_trends,
+)
+from testamaton.store import STORE_PATH, ResultStore
+from testamaton.suites import import_suite
+from testamaton.watch import watch as watch_suite
+
+
+@click.command()
+@click.argument("suite")
+@click.option("--watch", is_flag=True, help="Stay resident and rerun affected tests.")
+@click.option(
+    "--path",
+    "paths",
+    multiple=True,
+    help="Directory to watch, defaults to the directory of the suite.",
+)
+@click.option("--interval", default=0.5, show_default=True, help="Poll interval, s.")
+@click.option("--select", default=None, help='Tag expression, e.g. "db and not slow".')
+@click.option("--name", "names", multiple=True, help="Substring or glob of test names.")
+@click.option("--skip-tag", "tags", multiple=True, help="Skip tests with this tag.")
+@click.option("--concurrency", default=1, show_default=True)
+@click.option("--reruns", default=0, show_default=True, help="Reruns of failures.")
+@click.option("--no-capture", is_flag=True, help="Do not capture test output.")
+@click.option(
+    "--loop",
+    type=click.Choice(["asyncio", "uvloop", "auto"]),
+    default=None,
+    help="Event loop implementation.",
+)
+@click.option(
+    "--sample-usage",
+    "usage",
+    default=None,
+    help="Sample resource usage into this CSV file and summarize it.",
+)
+@click.option(
+    "--store",
+    default=None,
+    help=f"Record results in this SQLite result store, e.g. {STORE_PATH}.",
+)
+@click.option(
+    "--slow-callback",
+    type=float,
+    default=None,
+    help="Report loop stalls longer than this many seconds in async tests.",
+)
+def main(
+    suite: str,
+    watch: bool,
+    paths: Tuple[str, ...],
+    interval: float,
+    select: Optional[str],
+    names: Tuple[str, ...],
+    tags: Tuple[str, ...],
+    concurrency: int,
+    reruns: int,
+    no_capture: bool,
+    loop: Optional[str],
+    usage: Optional[str],
+    store: Optional[str],
+    slow_callback: Optional[float],
+) -> None:
+    """
+    Run the TestCase SUITE, given as path/to/suite.py:name or module:name.
+
+    The suite module is imported, so its own run() call must be guarded by
+    if __name__ == "__main__": or the suite runs twice. Exits with status 1
+    when a test failed.
+    """
+    if watch:
+        watch_suite(
+            suite,
+            roots=list(paths) or None,
+            interval=interval,
+            tags=list(tags),
+            select=select,
+            names=list(names) or None,
+            capture=not no_capture,
+            concurrency=concurrency,
+            reruns=reruns,
+            loop=loop,
+            slow_callback=slow_callback,
+            sample_usage=usage,
+            store=store,
+        )
+        return
+
+    module, attribute = import_suite(suite)
+    testcase = getattr(module, attribute)
+    testcase.run(
+        tags=list(tags),
+        concurrency=concurrency,
+        select=select,
+        names=list(names) or None,
+        capture=not no_capture,
+        reruns=reruns,
+        loop=loop,
+        slow_callback=slow_callback,
+        sample_usage=usage or False,
+        store=store or False,
+    )
+
+    if testcase.errors:
+        sys.exit(1)
+
+
+@click.group()
+@click.option("--db", default=STORE_PATH, show_default=True, help="Result store.")
+@click.option("--suite", "label", default=None, help="Only runs of this TestCase.")
+@click.pass_context
+def history(context: click.Context, db: str, label: Optional[str]) -> None:
+    """Query the results recorded with --store."""
+    context.obj = (ResultStore(db), label)
+
+
+@history.command()
+@click.option("--limit", default=10, show_default=True, help="Number of runs.")
+@click.pass_obj
+def trends(obj: Tuple[ResultStore, Optional[str]], limit: int) -> None:
+    """Outcome counts and duration of the recent runs."""
+    store, label = obj
+    print_run_trends(store.trends(limit, label))
+
+
+@history.command()
+@click.option("--runs", default=10, show_default=True, help="Recent runs to fit.")
+@click.option("--limit", default=10, show_default=True)
+@click.pass_obj
+def slowest(obj: Tuple[ResultStore, Optional[str]], runs: int, limit: int) -> None:
+    """Tests whose duration grows the most from run to run."""
+    store, label = obj
+    print_duration_trends(store.slowest_growing(runs, limit, label))
+
+
+@history.command()
+@click.option("--runs", default=50, show_default=True, help="Recent runs to count.")
+@click.option("--limit", default=10, show_default=True)
+@click.pass_obj
+def failures(obj: Tuple[ResultStore, Optional[str]], runs: int, limit: int) -> None:
+    """Tests failing most often, with their most common failure."""
+    store, label = obj
+    print_failure_frequency(store.failure_frequency(runs, limit, label))
+
+
+if __name__ == "__main__":
+    main()
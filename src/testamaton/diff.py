@@ -0,0 +1,263 @@
+import math
+import reprlib
+from array import array
+from typing import Any, Mapping, Optional, Sequence, Union
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+CHUNK = 1 << 16
+CONTEXT = 2
+NUMERIC_FORMATS = frozenset("bBhHiIlLqQfd")
+
+_repr = reprlib.Repr()
+_repr.maxstring = 80
+_repr.maxother = 80
+_repr.maxlist = _repr.maxtuple = _repr.maxdict = _repr.maxset = 8
+_repr.maxlevel = 3
+
+
+def short_repr(value: Any) -> str:
+    return _repr.repr(value)
+
+
+def is_buffer(value: Any) -> bool:
+    if isinstance(value, (str, list, tuple, dict)):
+        return False
+
+    try:
+        memoryview(value)
+    except TypeError:
+        return False
+
+    return True
+
+
+def _as_bytes_view(value: Any) -> memoryview:
+    view = memoryview(value)
+
+    if view.c_contiguous:
+        return view.cast("B")
+
+    return memoryview(view.tobytes())
+
+
+def _narrow(lhs: Any, rhs: Any, lo: int, hi: int) -> int:
+    """First differing index in ``[lo, hi)``, halving with slice comparisons."""
+    while hi - lo > 64:
+        mid = (lo + hi) // 2
+        if lhs[lo:mid] != rhs[lo:mid]:
+            hi = mid
+        else:
+            lo = mid
+
+    for index in range(lo, hi):
+        if lhs[index] != rhs[index]:
+            return index
+
+    return hi
+
+
+def first_difference_sequence(lhs: Sequence, rhs: Sequence) -> Optional[int]:
+    """
+    Index of the first differing element, ``None`` when equal.
+
+    Whole chunks are compared with slice equality (a C loop), only the chunk
+    that differs is narrowed down further.
+    """
+    length = min(len(lhs), len(rhs))
+
+    for offset in range(0, length, CHUNK):
+        end = min(offset + CHUNK, length)
+        if lhs[offset:end] != rhs[offset:end]:
+            return _narrow(lhs, rhs, offset, end)
+
+    return None if len(lhs) == len(rhs) else length
+
+
+def _flat(view: memoryview) -> memoryview:
+    if view.ndim == 1:
+        return view
+
+    try:
+        return memoryview(view.tobytes()).cast(view.format)
+    except (TypeError, ValueError):
+        return memoryview(view.tobytes())
+
+
+def first_difference_buffer(lhs: Any, rhs: Any) -> Optional[int]:
+    """
+    Element index of the first difference of two buffer-protocol objects.
+
+    Buffers of the same item format are compared as raw bytes; otherwise
+    equal bytes say nothing about equal values, so chunks are compared as
+    Python values instead.
+    """
+    left, right = memoryview(lhs), memoryview(rhs)
+
+    if left.format == right.format and left.itemsize == right.itemsize:
+        index = first_difference_sequence(_as_bytes_view(lhs), _as_bytes_view(rhs))
+        return None if index is None else index // left.itemsize
+
+    left, right = _flat(left), _flat(right)
+    length = min(len(left), len(right))
+
+    for offset in range(0, length, CHUNK):
+        end = min(offset + CHUNK, length)
+        left_chunk, right_chunk = left[offset:end].tolist(), right[offset:end].tolist()
+
+        if left_chunk != right_chunk:
+            return offset + first_difference_sequence(left_chunk, right_chunk)
+
+    return None if len(left) == len(right) else length
+
+
+def first_difference_mapping(lhs: Mapping, rhs: Mapping) -> Optional[Any]:
+    """First key missing on one side or mapped to different values."""
+    for key in lhs:
+        if key not in rhs or lhs[key] != rhs[key]:
+            return key
+
+    for key in rhs:
+        if key not in lhs:
+            return key
+
+    return None
+
+
+def _window(value: Sequence, index: int) -> str:
+    start, end = max(0, index - CONTEXT), min(index + CONTEXT + 1, len(value))
+    window = value[start:end]
+
+    if isinstance(window, memoryview):
+        window = window.tobytes() if window.format in "Bbc" else window.tolist()
+
+    return f"[{start}:{end}] = {short_repr(window)}"
+
+
+def _located(unit: str, index: int, lhs: Sequence, rhs: Sequence) -> str:
+    return (
+        f"first difference at {unit} {index} (length {len(lhs)} vs {len(rhs)})\n"
+        f"  left  {_window(lhs, index)}\n"
+        f"  right {_window(rhs, index)}"
+    )
+
+
+def describe_difference(lhs: Any, rhs: Any) -> Optional[str]:
+    """Bounded, human readable location of the first difference, if known."""
+    if isinstance(lhs, Mapping) and isinstance(rhs, Mapping):
+        key = first_difference_mapping(lhs, rhs)
+        if key is None:
+            return None
+        sizes = f"({len(lhs)} vs {len(rhs)} keys)"
+        if key not in rhs:
+            return f"key {short_repr(key)} only in left {sizes}"
+        if key not in lhs:
+            return f"key {short_repr(key)} only in right {sizes}"
+
+        nested = describe_difference(lhs[key], rhs[key])
+        detail = (
+            nested
+            if nested is not None
+            else f"{short_repr(lhs[key])} != {short_repr(rhs[key])}"
+        )
+        return f"at key {short_repr(key)}: {detail}"
+
+    if is_buffer(lhs) and is_buffer(rhs):
+        index = first_difference_buffer(lhs, rhs)
+        if index is None:
+            return None
+        return _located("index", index, memoryview(lhs), memoryview(rhs))
+
+    if isinstance(lhs, (list, tuple)) and isinstance(rhs, (list, tuple)):
+        if isinstance(lhs, list) != isinstance(rhs, list):
+            # A list never equals a tuple, whatever the elements are
+            kinds = f"{type(lhs).__name__} vs {type(rhs).__name__}"
+            nested = describe_difference(list(lhs), list(rhs))
+            return f"container types differ ({kinds})" + (
+                f", {nested}" if nested is not None else ""
+            )
+
+        index = first_difference_sequence(lhs, rhs)
+        if index is None:
+            return None
+        if index < len(lhs) and index < len(rhs):
+            nested = describe_difference(lhs[index], rhs[index])
+            if nested is not None:
+                return f"at index {index}: {nested}"
+        return _located("index", index, lhs, rhs)
+
+    if isinstance(lhs, str) and isinstance(rhs, str):
+        index = first_difference_sequence(lhs, rhs)
+        if index is None:
+            return None
+        return _located("character", index, lhs, rhs)
+
+    return None
+
+
+def _numeric_buffer(value: Any) -> Union[memoryview, array, None]:
+    if is_buffer(value):
+        view = memoryview(value)
+        if view.ndim == 1 and view.format in NUMERIC_FORMATS:
+            return view
+
+    try:
+        return array("d", value)
+    except TypeError:
+        return None
+
+
+def _isclose(left: Any, right: Any, rel_tol: float, abs_tol: float) -> Any:
+    """``math.isclose`` over numpy arrays."""
+    with numpy.errstate(invalid="ignore"):
+        difference = numpy.abs(left - right)
+        tolerance = numpy.maximum(
+            rel_tol * numpy.maximum(numpy.abs(left), numpy.abs(right)), abs_tol
+        )
+        return (left == right) | (
+            numpy.isfinite(difference) & (difference <= tolerance)
+        )
+
+
+def first_not_close(
+    lhs: Any, rhs: Any, rel_tol: float = 1e-9, abs_tol: float = 0.0
+) -> Optional[int]:
+    """
+    Index of the first element pair outside the tolerance, ``None`` if all close.
+
+    The tolerance is ``math.isclose``'s symmetric one whether or not numpy is
+    installed; numpy only vectorizes it. Without numpy, bitwise equal chunks
+    are skipped with C-level slice comparison and only differing chunks are
+    checked element by element.
+    """
+    left, right = _numeric_buffer(lhs), _numeric_buffer(rhs)
+
+    if left is None or right is None:
+        left, right = list(lhs), list(rhs)
+
+    length = min(len(left), len(right))
+
+    if numpy is not None and not isinstance(left, list):
+        close = _isclose(
+            numpy.asarray(left[:length], dtype=float),
+            numpy.asarray(right[:length], dtype=float),
+            rel_tol,
+            abs_tol,
+        )
+        if not close.all():
+            return int(numpy.argmin(close))
+    else:
+        for offset in range(0, length, CHUNK):
+            end = min(offset + CHUNK, length)
+            if left[offset:end] == right[offset:end]:
+                continue
+            for index in range(offset, end):
+                if not math.isclose(
+                    left[index], right[index], rel_tol=rel_tol, abs_tol=abs_tol
+                ):
+                    return index
+
+    return None if len(left) == len(right) else length
@@ -0,0 +1,374 @@
+import asyncio
+import itertools
+import json
+import os
+import socket
+import struct
+import sys
+import traceback
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple, Union
+
+import click
+
+from testamaton.capture import FDCapture
+from testamaton.reporter import TestResult
+from testamaton.suites import import_suite
+
+_HEADER = struct.Struct("!I")
+
+# Outcome record streamed from a worker:
+# [name, label, status, duration, output, postmessage, comment, captured]
+Record = List[Any]
+
+
+def parse_address(address: str) -> Tuple[str, Union[str, Tuple[str, int]]]:
+    """``unix:/path/to.sock`` or ``host:port`` -> (family, address)."""
+    if address.startswith("unix:"):
+        return "unix", address[len("unix:") :]
+
+    host, _, port = address.rpartition(":")
+    return "tcp", (host or "127.0.0.1", int(port))
+
+
+def encode_frame(message: Dict[str, Any]) -> bytes:
+    payload = json.dumps(message, separators=(",", ":")).encode("utf-8")
+    return _HEADER.pack(len(payload)) + payload
+
+
+async def read_frame(reader: asyncio.StreamReader) -> Dict[str, Any]:
+    (size,) = _HEADER.unpack(await reader.readexactly(_HEADER.size))
+    return json.loads(await reader.readexactly(size))
+
+
+def _recv_exactly(sock: socket.socket, size: int) -> bytes:
+    chunks = bytearray()
+
+    while len(chunks) < size:
+        chunk = sock.recv(size - len(chunks))
+        if not chunk:
+            raise ConnectionError("Coordinator closed the connection")
+        chunks += chunk
+
+    return bytes(chunks)
+
+
+def recv_frame(sock: socket.socket) -> Dict[str, Any]:
+    (size,) = _HEADER.unpack(_recv_exactly(sock, _HEADER.size))
+    return json.loads(_recv_exactly(sock, size))
+
+
+def error_record(name: str, reason: str) -> Record:
+    return [name, name, "error", None, reason, None, None, None]
+
+
+def record_from_result(name: str, result: TestResult) -> Record:
+    return [
+        name,
+        result.label,
+        result.status,
+        result.duration,
+        result.output,
+        result.postmessage,
+        result.comment,
+        result.captured,
+    ]
+
+
+class Coordinator:
+    """
+    Owns the test queue and hands out batches to connected workers.
+
+    Batches shrink as the queue drains (guided self-scheduling), so fast
+    workers keep pulling work until the end. Workers run a batch in order and
+    send each record as soon as its test finishes, so when a worker
+    disconnects the first unreported test of its batch is the one that was
+    running. Only that test is charged a requeue; the rest of the batch is
+    put back at the front of the queue as is. A test requeued more than
+    ``max_requeues`` times is reported as an error.
+    """
+
+    def __init__(
+        self,
+        names: List[str],
+        on_record: Callable[[Record], None],
+        hello: Dict[str, Any],
+        batch_size: int = 32,
+        max_requeues: int = 2,
+    ) -> None:
+        self.queue: Deque[str] = deque(names)
+        self.remaining: int = len(names)
+        self.on_record = on_record
+        self.hello = hello
+        self.batch_size = batch_size
+        self.max_requeues = max_requeues
+        # Unreported items of each worker's batch, in the order they run
+        self.inflight: Dict[int, Dict[str, None]] = {}
+        self.requeues: Dict[str, int] = {}
+        self.changed = asyncio.Condition()
+        self._ids = itertools.count(1)
+
+    @property
+    def finished(self) -> bool:
+        return self.remaining == 0
+
+    def _take(self, worker: int) -> List[str]:
+        workers = max(1, len(self.inflight))
+        size = max(1, min(self.batch_size, len(self.queue) // (workers * 2)))
+        batch = [self.queue.popleft() for _ in range(min(size, len(self.queue)))]
+        self.inflight[worker].update(dict.fromkeys(batch))
+        return batch
+
+    def _record(self, worker: int, record: Record) -> None:
+        if record[0] not in self.inflight[worker]:
+            return
+
+        del self.inflight[worker][record[0]]
+        self.remaining -= 1
+        self.on_record(record)
+
+    def _requeue(self, worker: int) -> None:
+        names = list(self.inflight.pop(worker, {}))
+
+        if not names:
+            return
+
+        running = names[0]
+        self.requeues[running] = self.requeues.get(running, 0) + 1
+
+        if self.requeues[running] > self.max_requeues:
+            names.pop(0)
+            self.remaining -= 1
+            self.on_record(error_record(running, "Worker died while running test"))
+
+        self.queue.extendleft(reversed(names))
+
+    def fail_remaining(self, reason: str) -> None:
+        for worker in list(self.inflight):
+            self.queue.extendleft(reversed(list(self.inflight.pop(worker))))
+
+        while self.queue:
+            name = self.queue.popleft()
+            self.remaining -= 1
+            self.on_record(error_record(name, reason))
+
+    async def _notify(self) -> None:
+        async with self.changed:
+            self.changed.notify_all()
+
+    async def wait_finished(self) -> None:
+        async with self.changed:
+            await self.changed.wait_for(lambda: self.finished)
+
+    async def handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        worker = next(self._ids)
+        self.inflight[worker] = {}
+
+        try:
+            await read_frame(reader)
+            writer.write(encode_frame({"type": "suite", **self.hello}))
+            await writer.drain()
+
+            while True:
+                message = await read_frame(reader)
+
+                for record in message.get("records", ()):
+                    self._record(worker, record)
+
+                if self.finished:
+                    await self._notify()
+
+                if message["type"] != "pull":
+                    continue
+
+                # Idle workers wait here: other workers may still die and
+                # hand their in-flight tests back to the queue.
+                async with self.changed:
+                    await self.changed.wait_for(lambda: self.queue or self.finished)
+
+                if not self.queue:
+                    writer.write(encode_frame({"type": "done"}))
+                    await writer.drain()
+                    return
+
+                batch = self._take(worker)
+                writer.write(encode_frame({"type": "batch", "items": batch}))
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self._requeue(worker)
+            self.inflight.pop(worker, None)
+            writer.close()
+            await self._notify()
+
+    async def serve(self, address: str) -> Tuple[asyncio.AbstractServer, str]:
+        family, target = parse_address(address)
+
+        if family == "unix":
+            server = await asyncio.start_unix_server(self.handle, target)
+            return server, address
+
+        server = await asyncio.start_server(self.handle, *target)
+        host, port = server.sockets[0].getsockname()[:2]
+        return server, f"{host}:{port}"
+
+
+async def _supervise(
+    coordinator: Coordinator,
+    address: str,
+    processes: List[asyncio.subprocess.Process],
+    restarts: List[int],
+) -> None:
+    """Keep one local worker alive while work remains, within the restart budget."""
+    while True:
+        process = await asyncio.create_subprocess_exec(
+            sys.executable, "-m", "testamaton.distributed", "--connect", address
+        )
+        processes.append(process)
+        await process.wait()
+
+        if coordinator.finished or restarts[0] <= 0:
+            return
+
+        restarts[0] -= 1
+
+
+async def _supervise_all(
+    coordinator: Coordinator,
+    address: str,
+    processes: List[asyncio.subprocess.Process],
+    restarts: List[int],
+    workers: int,
+) -> None:
+    await asyncio.gather(
+        *(_supervise(coordinator, address, processes, restarts) for _ in range(workers))
+    )
+
+
+async def coordinate(
+    names: List[str],
+    on_record: Callable[[Record], None],
+    hello: Dict[str, Any],
+    address: str = "127.0.0.1:0",
+    workers: int = 0,
+    batch_size: int = 32,
+    max_requeues: int = 2,
+) -> None:
+    """
+    Serve ``names`` to workers until every test has an outcome record.
+
+    ``workers`` local agents are spawned and restarted when they die while
+    work remains; external agents may connect to ``address`` as well.
+    """
+    coordinator = Coordinator(names, on_record, hello, batch_size, max_requeues)
+    server, bound = await coordinator.serve(address)
+    processes: List[asyncio.subprocess.Process] = []
+    restarts: List[int] = [workers * (max_requeues + 1)]
+
+    try:
+        finished = asyncio.ensure_future(coordinator.wait_finished())
+        pending = {finished}
+
+        if workers:
+            pending.add(
+                asyncio.ensure_future(
+                    _supervise_all(coordinator, bound, processes, restarts, workers)
+                )
+            )
+
+        done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+
+        if finished not in done:
+            # Every local worker has exited; give their connections a moment
+            # to be closed and requeued before declaring the rest lost.
+            await asyncio.sleep(0.1)
+            if not coordinator.finished:
+                coordinator.fail_remaining("No workers left to run test")
+                await coordinator._notify()
+
+        for future in pending:
+            future.cancel()
+    finally:
+        server.close()
+
+        for process in processes:
+            try:
+                await asyncio.wait_for(process.wait(), timeout=5)
+            except TimeoutError:
+                process.kill()
+                await process.wait()
+
+        await server.wait_closed()
+
+
+def run_worker(address: str, suite: Optional[str] = None) -> None:
+    """Connect to a coordinator, pull batches and stream outcome records back."""
+    from testamaton.sessions import Runner
+
+    family, target = parse_address(address)
+    sock = socket.socket(socket.AF_UNIX if family == "unix" else socket.AF_INET)
+    sock.connect(target)
+
+    try:
+        sock.sendall(encode_frame({"type": "hello", "pid": os.getpid()}))
+        hello = recv_frame(sock)
+        module, attribute = import_suite(suite or hello["suite"])
+        testcase = getattr(module, attribute)
+
+        runner = Runner(
+            testcase.tests,
+            testcase,
+            excluded=set(hello.get("excluded", ())),
+            capture=FDCapture() if hello.get("capture", True) else False,
+            update_snapshots=hello.get("update_snapshots", False),
+            reruns=hello.get("reruns", 0),
+            loop_factory=hello.get("loop"),
+            slow_callback=hello.get("slow_callback"),
+        )
+        results: List[TestResult] = []
+        runner.start_session()
+        # Set after the session starts: result hooks run on the coordinator
+        runner.report = results.append
+
+        try:
+            sock.sendall(encode_frame({"type": "pull"}))
+
+            while True:
+                message = recv_frame(sock)
+
+                if message["type"] == "done":
+                    break
+
+                for name in message["items"]:
+                    try:
+                        runner.run_tests([name])
+                    except Exception:  # noqa: BLE001
+                        # The worker survives; only crashes requeue the test
+                        records = [error_record(name, traceback.format_exc())]
+                    else:
+                        records = [
+                            record_from_result(name, result) for result in results
+                        ]
+
+                    results.clear()
+                    sock.sendall(encode_frame({"type": "records", "records": records}))
+
+                sock.sendall(encode_frame({"type": "pull"}))
+        finally:
+            runner.finish_session()
+    finally:
+        sock.close()
+
+
+@click.command()
+@click.option("--connect", "address", required=True, help="host:port or unix:/path")
+@click.option("--suite", default=None, help="path/to/suite.py:name override")
+def main(address: str, suite: Optional[str]) -> None:
+    run_worker(address, suite)
+
+
+if __name__ == "__main__":
+    main()
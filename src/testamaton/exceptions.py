@@ -5,7 +5,7 @@ class TestError(Exception):
         else:
             self.message = None
 
-    def get_explaination(self) -> None:
+    def get_explanation(self) -> str:
         return f"Message: {self.message if self.message else 'missing'}"
 
     def __str__(self) -> str:
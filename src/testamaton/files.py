@@ -0,0 +1,52 @@
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Dict
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+
+def read_json(path: Path) -> Dict[str, Any]:
+    try:
+        return json.loads(path.read_text("utf-8"))
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def atomic_write(path: Path, data: bytes) -> None:
+    """Replace ``path`` with ``data`` so readers never see a partial file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    descriptor, temporary = tempfile.mkstemp(dir=path.parent)
+
+    with os.fdopen(descriptor, "wb") as file:
+        file.write(data)
+
+    os.chmod(temporary, 0o644)
+    os.replace(temporary, path)
+
+
+def merge_json(path: Path, merge: Callable[[Dict[str, Any]], None]) -> Dict[str, Any]:
+    """
+    Apply ``merge`` to the JSON object stored at ``path`` and write it back.
+
+    The read-merge-write cycle holds an exclusive lock on a sibling ``.lock``
+    file, so concurrent runs sharing the file do not lose each other's
+    changes, and the new content replaces the file atomically.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    with open(path.with_suffix(".lock"), "w") as lock:
+        if fcntl is not None:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+
+        data = read_json(path)
+        merge(data)
+        atomic_write(
+            path, json.dumps(data, sort_keys=True, indent=2).encode("utf-8")
+        )
+
+    return data
@@ -0,0 +1,226 @@
+import asyncio
+import inspect
+from contextlib import nullcontext
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from testamaton.exceptions import FixtureError
+from testamaton.hooks import NO_HOOKS, Hooks
+from testamaton.loops import detached
+from testamaton.standard import Fixture, FixtureScope
+
+
+class FixtureManager:
+    """
+    Resolves fixtures requested by test parameters.
+
+    Function-scoped fixtures live for one test call, every other scope is
+    cached for the whole session. Generator fixtures are torn down by
+    advancing them once more. All methods run on the runner loop, session
+    fixtures are guarded by a per-name lock so concurrent tests share them.
+    """
+
+    def __init__(self, fixtures: Dict[str, Fixture], hooks: Hooks = NO_HOOKS) -> None:
+        self.fixtures = fixtures
+        self.hooks = hooks
+        self._session_values: Dict[str, Any] = {}
+        self._session_gens: List[Tuple[str, Any]] = []
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    async def _call(self, fixture: Fixture, kwargs: Dict[str, Any]) -> Tuple[Any, Any]:
+        handler = fixture.handler
+
+        if inspect.isasyncgenfunction(handler):
+            gen = handler(**kwargs)
+            return await gen.__anext__(), gen
+        elif inspect.isgeneratorfunction(handler):
+            gen = handler(**kwargs)
+            return next(gen), gen
+        elif inspect.iscoroutinefunction(handler):
+            return await handler(**kwargs), None
+
+        return handler(**kwargs), None
+
+    async def _finalize(self, name: str, gen: Any) -> None:
+        for hook in self.hooks.fixture_teardown:
+            hook(name)
+
+        try:
+            if inspect.isasyncgen(gen):
+                await gen.__anext__()
+            else:
+                next(gen)
+        except (StopIteration, StopAsyncIteration):
+            return
+        except Exception as ex:
+            raise FixtureError(f"Teardown of fixture '{name}' failed: {ex!r}") from ex
+
+        raise FixtureError(f"Fixture '{name}' yielded more than once")
+
+    async def _resolve(
+        self,
+        name: str,
+        local_values: Dict[str, Any],
+        local_gens: List[Tuple[str, Any]],
+        stack: Tuple[str, ...] = (),
+    ) -> Any:
+        if name in self._session_values:
+            return self._session_values[name]
+        if name in local_values:
+            return local_values[name]
+        if name in stack:
+            raise FixtureError(
+                f"Recursive fixture dependency: {' -> '.join(stack + (name,))}"
+            )
+
+        fixture = self.fixtures[name]
+
+        if fixture.scope is not FixtureScope.FUNCTION:
+            async with self._locks.setdefault(name, asyncio.Lock()):
+                if name in self._session_values:
+                    return self._session_values[name]
+
+                return await self._create(
+                    name, fixture, local_values, local_gens, stack
+                )
+
+        return await self._create(name, fixture, local_values, local_gens, stack)
+
+    async def _create(
+        self,
+        name: str,
+        fixture: Fixture,
+        local_values: Dict[str, Any],
+        local_gens: List[Tuple[str, Any]],
+        stack: Tuple[str, ...],
+    ) -> Any:
+        for param in inspect.signature(fixture.handler).parameters.values():
+            if param.name not in self.fixtures and param.default is param.empty:
+                raise FixtureError(
+                    f"Fixture '{name}' requests unknown fixture '{param.name}'"
+                )
+
+        kwargs = {
+            dep: await self._resolve(dep, local_values, local_gens, stack + (name,))
+            for dep in self.requested(fixture.handler)
+        }
+
+        # Session fixtures outlive the test that happens to create them, so
+        # do their background tasks
+        setup = nullcontext() if fixture.scope is FixtureScope.FUNCTION else detached()
+
+        try:
+            with setup:
+                value, gen = await self._call(fixture, kwargs)
+        except FixtureError:
+            raise
+        except Exception as ex:
+            raise FixtureError(f"Setup of fixture '{name}' failed: {ex!r}") from ex
+
+        for hook in self.hooks.fixture_setup:
+            hook(name, fixture.scope, value)
+
+        if fixture.scope is FixtureScope.FUNCTION:
+            local_values[name] = value
+            if gen is not None:
+                local_gens.append((name, gen))
+        else:
+            self._session_values[name] = value
+            if gen is not None:
+                self._session_gens.append((name, gen))
+
+        return value
+
+    def requested(
+        self,
+        func: Callable,
+        args: Union[list, tuple] = (),
+        kwargs: Optional[Dict[str, Any]] = None,
+    ) -> List[str]:
+        kwargs = kwargs or {}
+        params = list(inspect.signature(func).parameters.values())[len(args) :]
+
+        return [
+            param.name
+            for param in params
+            if param.name in self.fixtures and param.name not in kwargs
+        ]
+
+    async def setup(
+        self,
+        func: Callable,
+        args: Union[list, tuple] = (),
+        kwargs: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[Dict[str, Any], List[Tuple[str, Any]]]:
+        """Resolve fixtures for ``func``; returns injected kwargs and pending teardowns."""
+        local_values: Dict[str, Any] = {}
+        local_gens: List[Tuple[str, Any]] = []
+        requested = self.requested(func, args, kwargs)
+
+        try:
+            for name, fixture in self.fixtures.items():
+                if fixture.autouse:
+                    await self._resolve(name, local_values, local_gens)
+
+            injected = {
+                name: await self._resolve(name, local_values, local_gens)
+                for name in requested
+            }
+        except Exception:
+            await self.teardown(local_gens)
+            raise
+
+        return injected, local_gens
+
+    async def teardown(self, gens: List[Tuple[str, Any]]) -> None:
+        errors: List[FixtureError] = []
+
+        for name, gen in reversed(gens):
+            try:
+                await self._finalize(name, gen)
+            except FixtureError as ex:
+                errors.append(ex)
+
+        gens.clear()
+
+        if errors:
+            raise errors[0]
+
+    async def replace(
+        self, fixtures: Dict[str, Fixture], changed: Iterable[str] = ()
+    ) -> None:
+        """
+        Swap in reloaded fixture definitions.
+
+        Session values of ``changed`` or removed fixtures, and of every fixture
+        depending on them, are torn down; the others stay cached.
+        """
+        self.fixtures = fixtures
+        stale = set(changed) | (self._session_values.keys() - fixtures.keys())
+
+        grown = True
+        while grown:
+            dependents = {
+                name
+                for name, fixture in fixtures.items()
+                if set(self.requested(fixture.handler)) & stale
+            }
+            grown = not dependents <= stale
+            stale |= dependents
+
+        gens = [(name, gen) for name, gen in self._session_gens if name in stale]
+        self._session_gens = [
+            (name, gen) for name, gen in self._session_gens if name not in stale
+        ]
+
+        for name in stale:
+            self._session_values.pop(name, None)
+            self._locks.pop(name, None)
+
+        await self.teardown(gens)
+
+    async def teardown_session(self) -> None:
+        try:
+            await self.teardown(self._session_gens)
+        finally:
+            self._session_values.clear()
+            self._locks.clear()
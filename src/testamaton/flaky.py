@@ -0,0 +1,77 @@
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from testamaton.files import merge_json, read_json
+from testamaton.loops import LOOP_WARNING
+
+HISTORY_PATH = os.path.join(".testamaton", "history.json")
+WINDOW = 20
+
+# Outcome symbols kept in the history window
+OUTCOMES: Dict[str, str] = {
+    "success": "P",
+    "flaky": "R",
+    "error": "F",
+    "warning": "F",
+}
+
+
+def history_status(status: Optional[str], postmessage: Optional[str]) -> Optional[str]:
+    """Status to record; a pass reported as a warning for loop issues is a pass."""
+    if status == "warning" and postmessage == LOOP_WARNING:
+        return "success"
+
+    return status
+
+
+class FlakyHistory:
+    """
+    Local pass/fail history of every test, kept in a small JSON file.
+
+    Each test keeps its last ``window`` outcomes as a string of ``P`` (passed),
+    ``F`` (failed) and ``R`` (passed on rerun). A test is known to be flaky
+    when its window holds a rerun pass or both passes and failures. Outcomes
+    of the current run are merged into the file on ``save``, so parallel runs
+    sharing one history do not overwrite each other.
+    """
+
+    def __init__(self, path: str = HISTORY_PATH, window: int = WINDOW) -> None:
+        self.path = Path(path)
+        self.window = window
+        self.outcomes: Dict[str, str] = self._load()
+        self.changes: Dict[str, str] = {}
+
+    def _load(self) -> Dict[str, str]:
+        return read_json(self.path)
+
+    def record(self, name: str, status: Optional[str]) -> None:
+        symbol = OUTCOMES.get(status)
+
+        if symbol is None:
+            return
+
+        self.outcomes[name] = (self.outcomes.get(name, "") + symbol)[-self.window :]
+        self.changes[name] = (self.changes.get(name, "") + symbol)[-self.window :]
+
+    def is_flaky(self, name: str) -> bool:
+        outcomes = self.outcomes.get(name, "")
+        return "R" in outcomes or ("P" in outcomes and "F" in outcomes)
+
+    def order(self, names: Iterable[str]) -> List[str]:
+        """Known-flaky tests last, the relative order is kept otherwise."""
+        names = list(names)
+        return [name for name in names if not self.is_flaky(name)] + [
+            name for name in names if self.is_flaky(name)
+        ]
+
+    def save(self) -> None:
+        if not self.changes:
+            return
+
+        def merge(outcomes: Dict[str, Any]) -> None:
+            for name, symbols in self.changes.items():
+                outcomes[name] = (outcomes.get(name, "") + symbols)[-self.window :]
+
+        self.outcomes = merge_json(self.path, merge)
+        self.changes.clear()
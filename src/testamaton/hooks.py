@@ -0,0 +1,93 @@
+from dataclasses import dataclass, fields
+from typing import Any, Callable, Iterable, Tuple
+
+Calls = Tuple[Callable, ...]
+
+
+class Plugin:
+    """
+    Optional base class for plugins; only overridden methods are called.
+
+    Any object (or module) with some of these names as attributes works as a
+    plugin as well. Hooks are called synchronously on the runner thread, in
+    plugin registration order.
+    """
+
+    def collect(self, testcase: Any, name: str, func: Callable) -> None:
+        """A test was registered with ``TestCase.test``."""
+
+    def session_start(self, runner: Any) -> None:
+        """The runner loop and fixtures are set up, no test ran yet."""
+
+    def session_finish(self, runner: Any) -> None:
+        """All tests ran, session fixtures are not torn down yet."""
+
+    def before_test(self, runner: Any, name: str, test: Callable) -> None:
+        pass
+
+    def after_test(self, runner: Any, name: str, test: Callable, status: str) -> None:
+        pass
+
+    def result(self, result: Any) -> None:
+        """A ``TestResult`` was reported."""
+
+    def fixture_setup(self, name: str, scope: Any, value: Any) -> None:
+        pass
+
+    def fixture_teardown(self, name: str) -> None:
+        """A generator fixture was finalized."""
+
+    def report(self, testcase: Any, report: Any) -> None:
+        """The summary ``TestsExeecutionReport`` of a run."""
+
+
+@dataclass(frozen=True)
+class Hooks:
+    """
+    Call lists resolved from the registered plugins.
+
+    Built once per session, so call sites only test an empty tuple when no
+    plugin implements a hook.
+    """
+
+    collect: Calls = ()
+    session_start: Calls = ()
+    session_finish: Calls = ()
+    before_test: Calls = ()
+    after_test: Calls = ()
+    result: Calls = ()
+    fixture_setup: Calls = ()
+    fixture_teardown: Calls = ()
+    report: Calls = ()
+
+
+NO_HOOKS = Hooks()
+
+
+def implements(plugin: Any, name: str) -> bool:
+    method = getattr(plugin, name, None)
+
+    if not callable(method):
+        return False
+    if isinstance(plugin, Plugin):
+        return getattr(type(plugin), name) is not getattr(Plugin, name)
+
+    return True
+
+
+def compile_hooks(plugins: Iterable[Any]) -> Hooks:
+    plugins = list(plugins)
+
+    if not plugins:
+        return NO_HOOKS
+
+    return Hooks(
+        **{
+            field.name: tuple(
+                getattr(plugin, field.name)
+                for plugin in plugins
+                if implements(plugin, field.name)
+            )
+            for field in fields(Hooks)
+        }
+    )
@@ -0,0 +1,78 @@
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, AsyncGenerator, Dict, Optional
+
+from testamaton.standard import Fixture, FixtureScope
+
+if TYPE_CHECKING:
+    from aiohttp import ClientSession, web
+    from aiohttp.test_utils import TestServer
+
+
+@dataclass
+class HTTPClientConfig:
+    """
+    Settings of the pooled ``http_client`` fixture.
+
+    Override the ``http_client_config`` fixture to change them for a session.
+    """
+
+    limit: int = 100
+    limit_per_host: int = 0
+    keepalive_timeout: float = 30.0
+    timeout: Optional[float] = 30.0
+    base_url: Optional[str] = None
+
+
+def http_client_config() -> HTTPClientConfig:
+    return HTTPClientConfig()
+
+
+async def http_client(
+    http_client_config: HTTPClientConfig,
+) -> AsyncGenerator["ClientSession", None]:
+    # aiohttp is imported on first use, suites without HTTP tests never load it
+    from aiohttp import ClientSession, ClientTimeout, TCPConnector
+
+    connector = TCPConnector(
+        limit=http_client_config.limit,
+        limit_per_host=http_client_config.limit_per_host,
+        keepalive_timeout=http_client_config.keepalive_timeout,
+    )
+
+    async with ClientSession(
+        base_url=http_client_config.base_url,
+        connector=connector,
+        timeout=ClientTimeout(total=http_client_config.timeout),
+    ) as session:
+        yield session
+
+
+async def http_server(
+    http_app: "web.Application",
+) -> AsyncGenerator["TestServer", None]:
+    """In-process ``aiohttp.web`` server for the ``http_app`` fixture, started once."""
+    from aiohttp.test_utils import TestServer
+
+    server = TestServer(http_app)
+    await server.start_server()
+
+    try:
+        yield server
+    finally:
+        await server.close()
+
+
+def builtin_fixtures() -> Dict[str, Fixture]:
+    return {
+        "http_client_config": Fixture(
+            handler=http_client_config,
+            scope=FixtureScope.SESSION,
+            name="http_client_config",
+        ),
+        "http_client": Fixture(
+            handler=http_client, scope=FixtureScope.SESSION, name="http_client"
+        ),
+        "http_server": Fixture(
+            handler=http_server, scope=FixtureScope.SESSION, name="http_server"
+        ),
+    }
@@ -0,0 +1,108 @@
+import asyncio
+import traceback
+from time import perf_counter, perf_counter_ns
+from typing import Awaitable, Callable, List, Optional
+
+from testamaton.reporter import LoadReport
+from testamaton.standard import LoadProfile
+
+
+class LatencyHistogram:
+    """
+    Fixed-memory log-linear latency histogram (HDR-style).
+
+    Values are recorded in microseconds. Every power-of-two range is split
+    into ``2 ** sub_bucket_bits`` linear sub-buckets, so the relative error
+    stays below ``1 / 2 ** sub_bucket_bits`` regardless of the magnitude and
+    memory does not grow with the number of samples.
+    """
+
+    def __init__(self, max_value: int = 3_600_000_000, sub_bucket_bits: int = 7) -> None:
+        self.sub_bucket_bits = sub_bucket_bits
+        self.sub_bucket_count = 1 << sub_bucket_bits
+        self.max_value = max_value
+        self.counts: List[int] = [0] * (self._index(max_value) + 1)
+        self.total: int = 0
+        self.max: int = 0
+
+    def _index(self, value: int) -> int:
+        if value < (self.sub_bucket_count << 1):
+            return value
+
+        shift = value.bit_length() - self.sub_bucket_bits - 1
+        return shift * self.sub_bucket_count + (value >> shift)
+
+    def _value(self, index: int) -> int:
+        if index < (self.sub_bucket_count << 1):
+            return index
+
+        shift = index // self.sub_bucket_count - 1
+        top = index - shift * self.sub_bucket_count
+        return ((top + 1) << shift) - 1
+
+    def record(self, value: int) -> None:
+        value = min(max(value, 0), self.max_value)
+        self.counts[self._index(value)] += 1
+        self.total += 1
+        self.max = max(self.max, value)
+
+    def percentile(self, percent: float) -> int:
+        if not self.total:
+            return 0
+
+        threshold = max(1, round(self.total * percent / 100))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= threshold:
+                return min(self._value(index), self.max)
+
+        return self.max
+
+
+async def run_load(
+    func: Callable[..., Awaitable], profile: LoadProfile, *args, **kwargs
+) -> LoadReport:
+    """Drive ``func`` with ``profile.concurrency`` workers on the running loop."""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + profile.duration if profile.duration is not None else None
+    histogram = LatencyHistogram()
+    issued: int = 0
+    errors: int = 0
+    first_error: Optional[str] = None
+
+    async def worker() -> None:
+        nonlocal issued, errors, first_error
+
+        while True:
+            if profile.requests is not None and issued >= profile.requests:
+                return
+            if deadline is not None and loop.time() >= deadline:
+                return
+
+            issued += 1
+            start = perf_counter_ns()
+            try:
+                await func(*args, **kwargs)
+            except Exception as ex:  # noqa: BLE001 - every failure is a load error
+                errors += 1
+                if first_error is None:
+                    first_error = "".join(traceback.format_exception_only(ex)).strip()
+            histogram.record((perf_counter_ns() - start) // 1000)
+
+    start: float = perf_counter()
+    await asyncio.gather(*(worker() for _ in range(profile.concurrency)))
+    elapsed: float = perf_counter() - start
+
+    return LoadReport(
+        total=histogram.total,
+        errors=errors,
+        elapsed=elapsed,
+        concurrency=profile.concurrency,
+        p50=histogram.percentile(50) / 1000,
+        p90=histogram.percentile(90) / 1000,
+        p99=histogram.percentile(99) / 1000,
+        max=histogram.max / 1000,
+        first_error=first_error,
+    )
+
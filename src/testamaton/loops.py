@@ -0,0 +1,252 @@
+import asyncio
+import sys
+import threading
+import traceback
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Callable, Dict, Iterator, List, Optional, Set, Union
+
+from testamaton.exceptions import TestValidationError
+
+LoopFactory = Callable[[], asyncio.AbstractEventLoop]
+
+STACK_FRAMES = 3
+# Postmessage of passing tests reported as warnings for loop issues
+LOOP_WARNING = "LOOP"
+
+
+def _uvloop() -> asyncio.AbstractEventLoop:
+    try:
+        import uvloop
+    except ImportError:
+        raise TestValidationError(
+            "Loop 'uvloop' requires the uvloop package"
+        ) from None
+
+    return uvloop.new_event_loop()
+
+
+def _auto() -> asyncio.AbstractEventLoop:
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.new_event_loop()
+
+    return uvloop.new_event_loop()
+
+
+LOOP_FACTORIES: Dict[str, LoopFactory] = {
+    "asyncio": asyncio.new_event_loop,
+    "uvloop": _uvloop,
+    "auto": _auto,
+}
+
+
+def resolve_loop_factory(factory: Union[str, LoopFactory, None]) -> LoopFactory:
+    """``None`` or ``"asyncio"``, ``"uvloop"``, ``"auto"`` or a loop factory."""
+    if factory is None:
+        return asyncio.new_event_loop
+    if callable(factory):
+        return factory
+
+    try:
+        return LOOP_FACTORIES[factory]
+    except KeyError:
+        raise TestValidationError(
+            f"Unknown loop '{factory}', expected one of {', '.join(LOOP_FACTORIES)}"
+        ) from None
+
+
+@dataclass
+class Stall:
+    duration: float
+    stack: Optional[str] = None
+
+
+@dataclass
+class LoopUsage:
+    """Loop activity observed while one async test was running."""
+
+    label: str
+    slow_callback: float
+    blocked: float = 0.0
+    stalls: List[Stall] = field(default_factory=list)
+    pending: List[str] = field(default_factory=list)
+    before: Set[asyncio.Task] = field(default_factory=set)
+    token: Optional[Token] = None
+
+    def describe(self) -> Optional[str]:
+        if not self.stalls and not self.pending:
+            return None
+
+        lines: List[str] = []
+
+        if self.stalls:
+            lines.append(f"Loop blocked for {self.blocked * 1000:.1f}ms in total")
+
+        for stall in self.stalls:
+            lines.append(
+                f"Loop blocked for {stall.duration * 1000:.1f}ms "
+                f"(slow callback threshold {self.slow_callback * 1000:.0f}ms)"
+            )
+            if stall.stack:
+                lines.append(stall.stack)
+
+        if self.pending:
+            lines.append(f"{len(self.pending)} task(s) left pending after the test:")
+            lines.extend(f"  {task}" for task in self.pending)
+
+        return "\n".join(lines)
+
+
+_current_usage: ContextVar[Optional[LoopUsage]] = ContextVar(
+    "testamaton_loop_usage", default=None
+)
+
+
+@contextmanager
+def detached() -> Iterator[None]:
+    """
+    Tasks created inside, directly or by callbacks registered inside (e.g. a
+    server's connection handlers), do not belong to the running test.
+    """
+    token = _current_usage.set(None)
+
+    try:
+        yield
+    finally:
+        _current_usage.reset(token)
+
+
+class LoopMonitor:
+    """
+    Measures how long the runner loop is blocked, with any loop backend.
+
+    A heartbeat timer ticks on the loop every ``interval`` seconds; the delay
+    of a tick past its deadline is time in which the loop could not run
+    callbacks, and it is charged to every async test running at that moment.
+    A stall longer than ``slow_callback`` is reported like debug mode does:
+    a watchdog thread samples the loop thread's stack while the stall is
+    still in progress, without debug mode's per-callback overhead.
+    """
+
+    def __init__(
+        self,
+        slow_callback: float = 0.1,
+        interval: float = 0.01,
+        tolerance: float = 0.002,
+    ) -> None:
+        self.slow_callback = slow_callback
+        self.interval = interval
+        self.tolerance = tolerance
+        self.blocked: float = 0.0
+        self.active: List[LoopUsage] = []
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._deadline: float = 0.0
+        self._stack: Optional[str] = None
+        self._handle: Optional[asyncio.TimerHandle] = None
+        self._thread_id: Optional[int] = None
+        self._stopped = threading.Event()
+        self._watchdog: Optional[threading.Thread] = None
+
+    def start(self, loop: asyncio.AbstractEventLoop) -> None:
+        self.loop = loop
+        self._thread_id = threading.get_ident()
+        self._stopped.clear()
+        self._schedule()
+        self._watchdog = threading.Thread(
+            target=self._watch, name="testamaton-loop-watchdog", daemon=True
+        )
+        self._watchdog.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+
+        if self._watchdog is not None:
+            self._watchdog.join()
+            self._watchdog = None
+
+    def _schedule(self) -> None:
+        self._deadline = perf_counter() + self.interval
+        self._handle = self.loop.call_later(self.interval, self._tick)
+
+    def _charge(self, now: float) -> None:
+        overdue = now - self._deadline
+
+        if overdue <= self.tolerance:
+            return
+
+        self.blocked += overdue
+        stall = (
+            Stall(overdue, self._stack) if overdue >= self.slow_callback else None
+        )
+
+        for usage in self.active:
+            usage.blocked += overdue
+            if stall is not None:
+                usage.stalls.append(stall)
+
+        self._stack = None
+        # The overdue time is accounted, later checks only see new delays
+        self._deadline = now
+
+    def _tick(self) -> None:
+        self._charge(perf_counter())
+        self._schedule()
+
+    def _watch(self) -> None:
+        period = max(self.slow_callback / 2, 0.001)
+
+        while not self._stopped.wait(period):
+            deadline = self._deadline
+
+            if self._stack is not None:
+                continue
+            if perf_counter() - deadline < self.slow_callback:
+                continue
+
+            frame = sys._current_frames().get(self._thread_id)
+
+            if frame is not None and deadline == self._deadline:
+                self._stack = "".join(
+                    traceback.format_stack(frame, limit=STACK_FRAMES)
+                ).rstrip()
+
+    def enter(self, label: str) -> LoopUsage:
+        # Delays that happened before the test, e.g. while the loop was not
+        # running between batches, are not charged to it
+        self._charge(perf_counter())
+        usage = LoopUsage(label, self.slow_callback)
+
+        if not hasattr(asyncio.Task, "get_context"):
+            usage.before = asyncio.all_tasks(self.loop)
+
+        usage.token = _current_usage.set(usage)
+        self.active.append(usage)
+        return usage
+
+    def leave(self, usage: LoopUsage) -> LoopUsage:
+        self._charge(perf_counter())
+        self.active.remove(usage)
+        _current_usage.reset(usage.token)
+
+        current = asyncio.current_task(self.loop)
+
+        for task in asyncio.all_tasks(self.loop):
+            if task is current or task in usage.before:
+                continue
+            if hasattr(task, "get_context") and (
+                task.get_context().get(_current_usage) is not usage
+            ):
+                continue
+
+            usage.pending.append(repr(task))
+
+        usage.before = set()
+        return usage
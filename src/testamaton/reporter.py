@@ -3,14 +3,19 @@ import platform
 import shutil
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, Optional
+from time import perf_counter
+from typing import Any, Dict, Iterable, List, Optional, Self
 
 from rich import box, print
-from rich.console import Console
+from rich.console import Console, Group
+from rich.live import Live
 from rich.table import Table
 from rich.text import Text
 from rich.measure import measure_renderables
 
+from testamaton.store import DurationTrend, FailureFrequency, RunSummary
+from testamaton.usage import UsageSummary
+
 console = Console()
 
 
@@ -21,6 +26,7 @@ class TestsExeecutionReport:
     warnings: int
     errors: int
     skipped: int
+    flaky: int = 0
 
     @property
     def passed_percent(self) -> int:
@@ -38,6 +44,31 @@ class TestsExeecutionReport:
     def skipped_percent(self) -> int:
         return int((self.skipped / self.total) * 100) if self.total > 0 else 0
 
+    @property
+    def flaky_percent(self) -> int:
+        return int((self.flaky / self.total) * 100) if self.total > 0 else 0
+
+
+@dataclass
+class LoadReport:
+    total: int
+    errors: int
+    elapsed: float
+    concurrency: int
+    p50: float
+    p90: float
+    p99: float
+    max: float
+    first_error: Optional[str] = None
+
+    @property
+    def rps(self) -> float:
+        return self.total / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def error_rate(self) -> float:
+        return self.errors / self.total if self.total > 0 else 0.0
+
 
 @dataclass
 class TestResult:
@@ -47,6 +78,10 @@ class TestResult:
     output: Optional[Any] = None
     postmessage: Optional[str] = ""
     comment: Optional[str] = None
+    captured: Optional[str] = None
+    duration: Optional[float] = None
+    blocked: Optional[float] = None
+    name: Optional[str] = None
 
 
 def print_results_table(report: TestsExeecutionReport) -> None:
@@ -81,11 +116,146 @@ def print_results_table(report: TestsExeecutionReport) -> None:
         f"{report.skipped_percent}%",
         style="black bold on blue",
     )
+    table.add_row(
+        str(report.flaky),
+        "Flaky",
+        f"{report.flaky_percent}%",
+        style="black bold on magenta",
+    )
 
     console = Console()
     console.print(table)
 
 
+def print_load_report(label: str, report: LoadReport) -> None:
+    table = Table(title=f"Load: {label}", expand=True, box=box.ROUNDED)
+
+    table.add_column("Metric", style="cyan")
+    table.add_column("Value", style="cyan", justify="right")
+
+    table.add_row("Requests", str(report.total))
+    table.add_row("Concurrency", str(report.concurrency))
+    table.add_row("Elapsed", f"{report.elapsed:.3f}s")
+    table.add_row("RPS", f"{report.rps:.1f}")
+    table.add_row("p50", f"{report.p50:.3f}ms")
+    table.add_row("p90", f"{report.p90:.3f}ms")
+    table.add_row("p99", f"{report.p99:.3f}ms")
+    table.add_row("max", f"{report.max:.3f}ms")
+    table.add_row(
+        "Error rate",
+        f"{report.error_rate * 100:.2f}% ({report.errors})",
+        style="black bold on red" if report.errors else None,
+    )
+
+    if report.first_error is not None:
+        table.add_row("First error", Text(report.first_error), style="red")
+
+    console.print(table)
+
+
+def print_usage_report(summary: UsageSummary) -> None:
+    table = Table(
+        title=f"Resource usage ({summary.samples} samples every {summary.interval}s)",
+        expand=True,
+        box=box.ROUNDED,
+    )
+
+    table.add_column("Metric", style="cyan")
+    table.add_column("Average", style="cyan", justify="right")
+    table.add_column("Peak", style="cyan", justify="right")
+    table.add_column("At", style="cyan", justify="right")
+    table.add_column("Running at peak", style="cyan")
+
+    for metric in summary.metrics.values():
+        if metric.peak is None:
+            table.add_row(metric.name, "-", "-", "-", "")
+            continue
+
+        table.add_row(
+            metric.name,
+            f"{metric.average:.1f}",
+            f"{metric.peak:.1f}",
+            f"{metric.peak_at:.1f}s",
+            Text(", ".join(metric.peak_tests)),
+        )
+
+    console.print(table)
+
+    if summary.path is not None:
+        console.print(f"[dim]Usage samples written to {summary.path}[/dim]")
+
+
+def print_run_trends(runs: List[RunSummary]) -> None:
+    table = Table(title="Recent runs", expand=True, box=box.ROUNDED)
+
+    table.add_column("Run", style="cyan", justify="right")
+    table.add_column("Started", style="cyan")
+    table.add_column("Suite", style="cyan")
+    table.add_column("Revision", style="cyan")
+    table.add_column("Total", style="cyan", justify="right")
+    table.add_column("Passed", style="green", justify="right")
+    table.add_column("Errors", style="red", justify="right")
+    table.add_column("Flaky", style="magenta", justify="right")
+    table.add_column("Duration", style="cyan", justify="right")
+
+    for run in runs:
+        table.add_row(
+            str(run.id),
+            datetime.fromtimestamp(run.started).strftime("%d-%m-%Y %H:%M:%S"),
+            Text(run.label or "-"),
+            run.revision or "-",
+            *(
+                "-" if value is None else str(value)
+                for value in (run.total, run.passed, run.errors, run.flaky)
+            ),
+            "-" if run.duration is None else f"{run.duration:.2f}s",
+        )
+
+    console.print(table)
+
+
+def print_duration_trends(trends: List[DurationTrend]) -> None:
+    table = Table(title="Slowest growing tests", expand=True, box=box.ROUNDED)
+
+    table.add_column("Test", style="cyan")
+    table.add_column("Runs", style="cyan", justify="right")
+    table.add_column("First", style="cyan", justify="right")
+    table.add_column("Last", style="cyan", justify="right")
+    table.add_column("Growth per run", style="yellow", justify="right")
+
+    for trend in trends:
+        table.add_row(
+            Text(trend.name),
+            str(trend.runs),
+            f"{trend.first * 1000:.1f}ms",
+            f"{trend.last * 1000:.1f}ms",
+            f"+{trend.slope * 1000:.2f}ms",
+        )
+
+    console.print(table)
+
+
+def print_failure_frequency(failures: List[FailureFrequency]) -> None:
+    table = Table(title="Most frequent failures", expand=True, box=box.ROUNDED)
+
+    table.add_column("Test", style="cyan")
+    table.add_column("Failed", style="red", justify="right")
+    table.add_column("Rate", style="red", justify="right")
+    table.add_column("Signature", style="cyan")
+    table.add_column("Message", style="cyan")
+
+    for failure in failures:
+        table.add_row(
+            Text(failure.name),
+            f"{failure.failures}/{failure.runs}",
+            f"{failure.rate * 100:.0f}%",
+            failure.signature or "-",
+            Text(failure.message or ""),
+        )
+
+    console.print(table)
+
+
 def strip_rich(text: str) -> str:
     if not text:
         return ""
@@ -130,10 +300,13 @@ def print_test_result(test_result: TestResult) -> None:
         "error": "[black bold on red]ERR [/black bold on red]",
         "warning": "[black bold on yellow]WARN[/black bold on yellow]",
         "skip": "[black bold on blue]SKIP[/black bold on blue]",
+        "flaky": "[black bold on magenta]FLKY[/black bold on magenta]",
     }.get(test_result.status, "[black bold on white]????[/black bold on white]")
 
     # Процент с Rich разметкой
-    percent_color = "green" if test_result.status == "success" else test_result.status
+    percent_color = {"success": "green", "flaky": "magenta"}.get(
+        test_result.status, test_result.status
+    )
     percent_str = f"[dim][{percent_color}][{str(test_result.percent).rjust(3)}%][/{percent_color}][/dim]"
 
     # Измеряем ширину процента
@@ -157,6 +330,7 @@ def print_test_result(test_result: TestResult) -> None:
         "error": "red",
         "warning": "yellow",
         "skip": "blue",
+        "flaky": "magenta",
     }.get(test_result.status, "white")
 
     # Собираем базовую строку
@@ -222,11 +396,141 @@ def print_test_result(test_result: TestResult) -> None:
         )
         if test_result.output:
             console.print(Text(test_result.output, style="red"))
+        if test_result.captured:
+            print_header("Captured output", style="dim")
+            console.print(Text(test_result.captured))
 
     elif test_result.status == "warning":
         console.print(final_line)
         if test_result.output:
             console.print(f"[yellow] > {test_result.output}[/yellow]\n")
 
+    elif test_result.status == "flaky":
+        console.print(final_line)
+        if test_result.output:
+            console.print(Text(f" > {test_result.output}", style="magenta"))
+
     elif test_result.status == "skip":
         console.print(final_line)
+
+
+class LiveProgress:
+    """
+    Live status region for long or concurrent runs.
+
+    Results only update counters; the region is redrawn by Rich at a fixed
+    rate, so render cost does not depend on how fast tests finish. Failures
+    and warnings are still printed as full lines above the region.
+    """
+
+    max_running_shown: int = 5
+
+    def __init__(
+        self,
+        names: Iterable[str],
+        concurrency: int = 1,
+        history: Optional[Dict[str, float]] = None,
+        refresh_per_second: float = 4,
+    ) -> None:
+        names = list(names)
+        history = history or {}
+
+        self.total: int = len(names)
+        self.concurrency = max(1, concurrency)
+        self.counts: Dict[str, int] = {
+            "success": 0,
+            "error": 0,
+            "warning": 0,
+            "skip": 0,
+            "flaky": 0,
+        }
+        self.running: Dict[str, float] = {}
+        self.completed: int = 0
+        self.observed: float = 0.0
+        self.expected_known: float = sum(history.get(name, 0.0) for name in names)
+        self.unknown: int = sum(1 for name in names if name not in history)
+        self.history = history
+        self.started_at: float = perf_counter()
+        self.live = Live(
+            self,
+            console=console,
+            refresh_per_second=refresh_per_second,
+            redirect_stdout=False,
+            redirect_stderr=False,
+            transient=True,
+        )
+
+    def __enter__(self) -> Self:
+        self.started_at = perf_counter()
+        self.live.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.live.stop()
+
+    def started(self, label: str) -> None:
+        self.running[label] = perf_counter()
+
+    def finished(self, name: str, label: str, duration: Optional[float]) -> None:
+        self.running.pop(label, None)
+        self.completed += 1
+
+        if duration is not None:
+            self.observed += duration
+
+        if name in self.history:
+            self.expected_known -= self.history[name]
+        else:
+            self.unknown -= 1
+
+    def report(self, test_result: TestResult) -> None:
+        self.counts[test_result.status] = self.counts.get(test_result.status, 0) + 1
+
+        if test_result.status in ("error", "warning", "flaky"):
+            print_test_result(test_result)
+
+    @property
+    def eta(self) -> Optional[float]:
+        if self.completed == 0 and self.expected_known == 0:
+            return None
+
+        mean = self.observed / self.completed if self.completed else 0.0
+        remaining = max(0.0, self.expected_known) + self.unknown * mean
+        return remaining / self.concurrency
+
+    def __rich__(self) -> Group:
+        elapsed = perf_counter() - self.started_at
+        rate = self.completed / elapsed if elapsed > 0 else 0.0
+        eta = self.eta
+
+        status = Text.assemble(
+            (f" {self.counts['success']} passed ", "black bold on green"),
+            " ",
+            (f" {self.counts['error']} errors ", "black bold on red"),
+            " ",
+            (f" {self.counts['warning']} warnings ", "black bold on yellow"),
+            " ",
+            (f" {self.counts['skip']} skipped ", "black bold on blue"),
+            " ",
+            (f" {self.counts['flaky']} flaky ", "black bold on magenta"),
+            f"  {self.completed}/{self.total}",
+            f"  {rate:.1f} tests/s",
+            f"  ETA {eta:.1f}s" if eta is not None else "  ETA --",
+        )
+
+        running = tuple(self.running.items())
+        now = perf_counter()
+        lines = [status]
+
+        for label, since in running[: self.max_running_shown]:
+            lines.append(Text(f"  running {label} ({now - since:.1f}s)", style="dim"))
+
+        if len(running) > self.max_running_shown:
+            lines.append(
+                Text(
+                    f"  ... and {len(running) - self.max_running_shown} more",
+                    style="dim",
+                )
+            )
+
+        return Group(*lines)
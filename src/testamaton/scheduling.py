@@ -0,0 +1,168 @@
+import asyncio
+from collections import deque
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from testamaton.exceptions import TestValidationError
+
+Demands = Dict[str, int]
+ScheduledItem = Tuple[Demands, Callable[[], Awaitable[Any]]]
+# A scheduled item with its position in the input, for FIFO waits
+Waiter = Tuple[int, Demands, Callable[[], Awaitable[Any]]]
+
+
+def normalize_resources(resources: Any) -> Demands:
+    """Turn ``["db", "ports"]`` or ``{"db": 1, "cpu": 2}`` into a demands dict."""
+    if not resources:
+        return {}
+    if isinstance(resources, dict):
+        return {name: int(units) for name, units in resources.items()}
+    if isinstance(resources, str):
+        return {resources: 1}
+
+    return {name: 1 for name in resources}
+
+
+class ResourcePool:
+    """
+    Counting pool of named resource groups.
+
+    Groups that were not declared behave as exclusive locks (capacity 1).
+    """
+
+    def __init__(self, capacities: Dict[str, int]) -> None:
+        self.capacities = dict(capacities)
+        self.in_use: Dict[str, int] = {}
+
+    def capacity(self, name: str) -> int:
+        return self.capacities.get(name, 1)
+
+    def validate(self, label: str, demands: Demands) -> None:
+        for name, units in demands.items():
+            if units < 1 or units > self.capacity(name):
+                raise TestValidationError(
+                    f"{label} requests {units} of '{name}' "
+                    f"with capacity {self.capacity(name)}"
+                )
+
+    def available(self, demands: Demands) -> bool:
+        return all(
+            self.in_use.get(name, 0) + units <= self.capacity(name)
+            for name, units in demands.items()
+        )
+
+    def acquire(self, demands: Demands) -> None:
+        for name, units in demands.items():
+            self.in_use[name] = self.in_use.get(name, 0) + units
+
+    def release(self, demands: Demands) -> None:
+        for name, units in demands.items():
+            self.in_use[name] -= units
+
+
+def _saturated(pool: ResourcePool, demands: Demands) -> Optional[str]:
+    return next(
+        (
+            name
+            for name, units in demands.items()
+            if pool.in_use.get(name, 0) + units > pool.capacity(name)
+        ),
+        None,
+    )
+
+
+async def schedule(
+    items: Iterable[ScheduledItem],
+    concurrency: int,
+    pool: ResourcePool,
+) -> None:
+    """
+    Run ``items`` with at most ``concurrency`` in flight and resource limits held.
+
+    Greedy list scheduling: whenever a slot frees up, the earliest items whose
+    demands currently fit are started, so a test waiting on a busy group never
+    blocks unrelated tests queued behind it. An item that does not fit waits
+    in a FIFO queue of the group it is blocked on; later items demanding that
+    group queue up behind it instead of overtaking it. A finished task only
+    wakes the waiters of the groups it released, so every item is parked and
+    woken a bounded number of times whatever the queue length.
+
+    When a task fails, the tasks still running are cancelled and awaited
+    before the failure propagates.
+    """
+    queue: Deque[Waiter] = deque(
+        (index, demands, factory) for index, (demands, factory) in enumerate(items)
+    )
+    waiters: Dict[str, Deque[Waiter]] = {}
+    # Groups whose first waiter may fit now
+    ready: Set[str] = set()
+    running: Dict[asyncio.Future, Demands] = {}
+
+    def start(demands: Demands, factory: Callable[[], Awaitable[Any]]) -> None:
+        pool.acquire(demands)
+        running[asyncio.ensure_future(factory())] = demands
+
+    def park(entry: Waiter, group: str) -> None:
+        waiters.setdefault(group, deque()).append(entry)
+
+    try:
+        while queue or waiters or running:
+            while ready and len(running) < concurrency:
+                group = min(ready, key=lambda name: waiters[name][0][0])
+                entry = waiters[group][0]
+                blocker = _saturated(pool, entry[1])
+
+                if blocker == group:
+                    ready.discard(group)
+                    continue
+
+                waiters[group].popleft()
+
+                if not waiters[group]:
+                    del waiters[group]
+                    ready.discard(group)
+
+                if blocker is None:
+                    start(entry[1], entry[2])
+                else:
+                    park(entry, blocker)
+
+            while queue and len(running) < concurrency:
+                entry = queue.popleft()
+                demands = entry[1]
+                group = next((name for name in demands if name in waiters), None)
+                group = group or _saturated(pool, demands)
+
+                if group is None:
+                    start(demands, entry[2])
+                else:
+                    park(entry, group)
+
+            if not running:
+                raise RuntimeError("Scheduler stalled with waiting items")
+
+            done: Set[asyncio.Future]
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+
+            for task in done:
+                demands = running.pop(task)
+                pool.release(demands)
+                ready.update(name for name in demands if name in waiters)
+
+            for task in done:
+                task.result()
+    finally:
+        for task in running:
+            task.cancel()
+
+        if running:
+            await asyncio.gather(*running, return_exceptions=True)
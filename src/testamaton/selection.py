@@ -0,0 +1,140 @@
+import re
+from fnmatch import fnmatchcase
+from typing import AbstractSet, Dict, Iterable, List, Optional, Set
+
+from testamaton.exceptions import TestValidationError
+
+_TOKEN_RE = re.compile(r"\(|\)|[^\s()]+")
+_KEYWORDS = {"and", "or", "not"}
+
+
+class TagExpression:
+    """
+    Boolean tag expression such as ``"db and not (slow or flaky)"``.
+
+    The expression is evaluated against a tag -> test names inverted index
+    with set operations, so the cost depends on the size of the matched
+    tag buckets rather than on the number of registered tests.
+    """
+
+    def __init__(self, source: str) -> None:
+        self.source = source
+        self.tokens: List[str] = _TOKEN_RE.findall(source)
+
+        if not self.tokens:
+            raise TestValidationError("Empty tag expression")
+
+    def evaluate(
+        self, index: Dict[str, Set[str]], universe: AbstractSet[str]
+    ) -> Set[str]:
+        self._index = index
+        self._universe = universe
+        self._pos = 0
+
+        result = self._parse_or()
+
+        if self._pos != len(self.tokens):
+            self._fail(f"unexpected '{self.tokens[self._pos]}'")
+
+        return result
+
+    def _fail(self, reason: str) -> None:
+        raise TestValidationError(f"Invalid tag expression '{self.source}': {reason}")
+
+    def _peek(self) -> Optional[str]:
+        return self.tokens[self._pos] if self._pos < len(self.tokens) else None
+
+    def _parse_or(self) -> Set[str]:
+        result = self._parse_and()
+
+        while self._peek() == "or":
+            self._pos += 1
+            result = result | self._parse_and()
+
+        return result
+
+    def _parse_and(self) -> Set[str]:
+        result = self._parse_not()
+
+        while self._peek() == "and":
+            self._pos += 1
+            result = result & self._parse_not()
+
+        return result
+
+    def _parse_not(self) -> Set[str]:
+        token = self._peek()
+
+        if token is None:
+            self._fail("unexpected end")
+        if token == "not":
+            self._pos += 1
+            return self._universe - self._parse_not()
+        if token == "(":
+            self._pos += 1
+            result = self._parse_or()
+            if self._peek() != ")":
+                self._fail("missing ')'")
+            self._pos += 1
+            return result
+        if token == ")" or token in _KEYWORDS:
+            self._fail(f"unexpected '{token}'")
+
+        self._pos += 1
+        return self._index.get(token, set())
+
+
+def match_names(names: Iterable[str], patterns: Iterable[str]) -> Set[str]:
+    """Names matching any pattern: glob when it has ``*?[``, substring otherwise."""
+    globs: List[str] = []
+    substrings: List[str] = []
+
+    for pattern in patterns:
+        (globs if any(char in pattern for char in "*?[") else substrings).append(
+            pattern
+        )
+
+    return {
+        name
+        for name in names
+        if any(sub in name for sub in substrings)
+        or any(fnmatchcase(name, pattern) for pattern in globs)
+    }
+
+
+def select_tests(
+    tests: Dict[str, object],
+    index: Dict[str, Set[str]],
+    expression: Optional[str] = None,
+    names: Optional[List[str]] = None,
+    order: Optional[Dict[str, int]] = None,
+) -> Dict[str, object]:
+    """
+    Resolve the selected subset of ``tests`` before anything is scheduled.
+
+    With ``order`` (registration positions) the subset is built from the
+    matched names alone, so a narrow expression does not scan every test.
+    """
+    if not expression and not names:
+        return tests
+
+    selected: AbstractSet[str] = tests.keys()
+
+    if expression:
+        selected = TagExpression(expression).evaluate(index, selected)
+    if names:
+        selected = match_names(selected, names)
+
+    if order is None:
+        return {name: test for name, test in tests.items() if name in selected}
+
+    return {name: tests[name] for name in sorted(selected, key=order.__getitem__)}
+
+
+def excluded_by_tags(index: Dict[str, Set[str]], tags: Iterable[str]) -> Set[str]:
+    excluded: Set[str] = set()
+
+    for tag in tags:
+        excluded |= index.get(tag, set())
+
+    return excluded
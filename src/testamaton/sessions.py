@@ -1,76 +1,236 @@
 import asyncio
 import inspect
 import traceback
-from typing import Any, Awaitable, Callable, List, Union
+from functools import partial
+from time import perf_counter
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 
-from testamaton.exceptions import SkippedTestException, TestError
+from testamaton.capture import FDCapture, OutputCapture
+from testamaton.exceptions import (
+    SkippedTestException,
+    TestError,
+    TestValidationError,
+)
+from testamaton.fixtures import FixtureManager
+from testamaton.flaky import FlakyHistory
+from testamaton.hooks import NO_HOOKS, Hooks, compile_hooks
+from testamaton.load import run_load
+from testamaton.loops import (
+    LOOP_WARNING,
+    LoopFactory,
+    LoopMonitor,
+    LoopUsage,
+    resolve_loop_factory,
+)
 from testamaton.reporter import (
+    LiveProgress,
+    LoadReport,
     TestResult,
     print_header,
+    print_load_report,
     print_platform,
     print_test_result,
 )
-from testamaton.standard import ExpectFailMarkup, SkipMarker
+from testamaton.scheduling import ResourcePool, normalize_resources, schedule
+from testamaton.snapshots import SnapshotSession, snapshot_case
+from testamaton.sources import keyed_arguments, parse_chunk_item
+from testamaton.standard import ExpectFailMarkup, Fixture, SkipMarker
+
+
+def _report_with_hooks(
+    report: Callable[[TestResult], None],
+    hooks: Tuple[Callable, ...],
+    result: TestResult,
+) -> None:
+    report(result)
+
+    for hook in hooks:
+        hook(result)
 
 
 class Runner:
-    def __init__(self, tests: int, testcase: object) -> None:
+    def __init__(
+        self,
+        tests: int,
+        testcase: object,
+        concurrency: int = 1,
+        excluded: Optional[Set[str]] = None,
+        capture: Union[bool, OutputCapture, FDCapture] = True,
+        update_snapshots: bool = False,
+        reruns: int = 0,
+        history: Optional[FlakyHistory] = None,
+        quarantine: bool = False,
+        loop_factory: Union[str, LoopFactory, None] = None,
+        slow_callback: Optional[float] = None,
+        plugins: Iterable[Any] = (),
+        durations: Optional[Dict[str, float]] = None,
+    ) -> None:
         self.tests = tests
         self.tests_count = len(self.tests)
         self.testcase = testcase
+        self.concurrency = concurrency
+        self.excluded: Set[str] = excluded or set()
+        self.completed: int = 0
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.fixtures: Optional[FixtureManager] = None
+        self.capture: Union[OutputCapture, FDCapture, None] = (
+            OutputCapture() if capture is True else capture or None
+        )
+        self.report: Callable[[TestResult], None] = print_test_result
+        self.progress: Optional[LiveProgress] = None
+        self.snapshots = SnapshotSession(update=update_snapshots)
+        self.reruns = reruns
+        self.history = history
+        self.quarantine = quarantine
+        self.loop_factory = resolve_loop_factory(loop_factory)
+        self.monitor: Optional[LoopMonitor] = (
+            LoopMonitor(slow_callback) if slow_callback is not None else None
+        )
+        self.plugins = list(plugins)
+        self.hooks: Hooks = NO_HOOKS
+        self.durations = durations
 
     def _print_prelude(self) -> None:
         print_header("runner session starts")
         print_platform(self.tests_count)
 
-    def _run_testinfo(self, test: Union[Callable, Awaitable], *args, **kwargs) -> Any:
-        if inspect.iscoroutinefunction(test):
-            result = asyncio.run(test(*args, **kwargs))
-        else:
-            result = test(*args, **kwargs)
-
-        return result
+    async def _run_testinfo(
+        self, test: Union[Callable, Awaitable], *args, **kwargs
+    ) -> Any:
+        injected, teardowns = await self.fixtures.setup(test, args, kwargs)
 
-    def _run_test_cycle(self, test: Union[Awaitable, Callable]) -> Any:
-        for n in range(test._testamatonmeta.count_of_launchs):
-            if test._testamatonmeta.arguments:
-                for argument in test._testamatonmeta.arguments:
-                    result = self._run_testinfo(test, *argument.args, **argument.kwargs)
+        try:
+            if self.concurrency > 1 and not inspect.iscoroutinefunction(test):
+                result = await asyncio.to_thread(test, *args, **kwargs, **injected)
             else:
-                result = self._run_testinfo(test)
+                result = test(*args, **kwargs, **injected)
+
+            if inspect.isawaitable(result):
+                result = await result
+        finally:
+            await self.fixtures.teardown(teardowns)
 
         return result
 
-    def _check_warnings(
-        self, result: Any, results: list, percent: int, test_name: str
-    ) -> None:
-        if len(results) > 0 and results[-1] == result and result is not None:
-            print_test_result(
-                TestResult(
-                    percent=percent,
-                    label=test_name,
-                    status="warning",
-                    output=f"Last result is equals current result ({results[-1]} == {result})",
-                )
+    async def _run_load(self, test: Union[Awaitable, Callable], *args, **kwargs) -> LoadReport:
+        profile = test._testamatonmeta.load
+
+        if not inspect.iscoroutinefunction(test):
+            raise TestValidationError(f"Load mode requires async test: {test.__name__}")
+
+        injected, teardowns = await self.fixtures.setup(test, args, kwargs)
+
+        try:
+            report = await run_load(test, profile, *args, **kwargs, **injected)
+        finally:
+            await self.fixtures.teardown(teardowns)
+
+        if self.capture is not None:
+            with self.capture.suspended():
+                print_load_report(test.__name__, report)
+        else:
+            print_load_report(test.__name__, report)
+
+        if (
+            profile.max_error_rate is not None
+            and report.error_rate > profile.max_error_rate
+        ):
+            raise TestError(
+                f"Error rate {report.error_rate:.2%} exceeds "
+                f"{profile.max_error_rate:.2%}, first error: {report.first_error}"
             )
-            self.testcase.warnings += 1
-            self.testcase.passed += 1
 
-    def _processing_tests_execution(
+        return report
+
+    async def _run_test_cycle(
+        self, test: Union[Awaitable, Callable], arguments: Any = None
+    ) -> Any:
+        if arguments is None:
+            arguments = test._testamatonmeta.arguments
+
+        token = self.snapshots.enter(test)
+
+        try:
+            return await self._run_arguments(test, arguments)
+        finally:
+            self.snapshots.leave(token)
+
+    async def _run_arguments(
+        self, test: Union[Awaitable, Callable], arguments: Any
+    ) -> Any:
+        # Sources may yield no cases at all, e.g. an empty JSONL file
+        result = None
+
+        if test._testamatonmeta.load is not None:
+            if arguments:
+                for argument in arguments:
+                    result = await self._run_load(
+                        test, *argument.args, **argument.kwargs
+                    )
+            else:
+                result = await self._run_load(test)
+
+            return result
+
+        for _ in range(test._testamatonmeta.count_of_launchs):
+            if arguments:
+                for case, argument in keyed_arguments(arguments):
+                    snapshot_case(case)
+                    result = await self._run_testinfo(
+                        test, *argument.args, **argument.kwargs
+                    )
+            else:
+                snapshot_case(None)
+                result = await self._run_testinfo(test)
+
+        return result
+
+    async def _processing_tests_execution(
         self,
-        tags: List[str],
         test_num: int,
         test_name: str,
         test: Union[Awaitable, Callable],
+        arguments: Any = None,
     ) -> None:
-        percent = int((test_num / self.tests_count) * 100)
-        results: list[Any] = []
+        marker = test._testamatonmeta.marker
+        captured: Optional[str] = None
+        started: float = perf_counter()
+        status: Optional[str] = None
+        loop_issues: Optional[str] = None
+        reruns: int = 0
+        max_reruns: int = 0 if isinstance(marker, ExpectFailMarkup) else self.reruns
+        failure: Optional[str] = None
+        usage: Optional[LoopUsage] = None
 
+        name = test_name
+        excluded = test_name in self.excluded
+        quarantined = (
+            self.quarantine
+            and self.history is not None
+            and self.history.is_flaky(test.__name__)
+        )
         lines: int = inspect.getsourcelines(test)[1]
         test_name = f"{test_name}:[line {lines}]"
 
+        if self.progress is not None:
+            self.progress.started(test_name)
+
+        for hook in self.hooks.before_test:
+            hook(self, name, test)
+
         try:
-            if tags and list(set(tags) & set(test.tags)):
+            if excluded:
                 raise SkippedTestException()
             elif isinstance(test._testamatonmeta.marker, SkipMarker):
                 marker = test._testamatonmeta.marker
@@ -82,57 +242,283 @@ class Runner:
             elif isinstance(test._testamatonmeta.marker, ExpectFailMarkup):
                 marker: ExpectFailMarkup = test._testamatonmeta.marker
 
-            result = self._run_test_cycle(test)
+            if self.monitor is not None and inspect.iscoroutinefunction(test):
+                usage = self.monitor.enter(test_name)
+
+            try:
+                # Failures are rerun in place, reusing the warm session fixtures;
+                # expected failures are never rerun.
+                while True:
+                    token = self.capture.start() if self.capture is not None else None
+
+                    try:
+                        await self._run_test_cycle(test, arguments)
+                    except BaseException as ex:
+                        if self.capture is not None:
+                            captured = self.capture.stop(token, keep=True)
+
+                        if (
+                            reruns >= max_reruns
+                            or isinstance(ex, SkippedTestException)
+                            or not isinstance(ex, Exception)
+                        ):
+                            raise
 
-            self._check_warnings(result, results, percent, test_name)
+                        reruns += 1
+                        failure = failure or "".join(
+                            traceback.format_exception_only(ex)
+                        ).strip()
+                    else:
+                        if self.capture is not None:
+                            self.capture.stop(token)
+                        break
+            finally:
+                if usage is not None:
+                    self.monitor.leave(usage)
 
-            results.append(result)
+            self.completed += 1
+            percent = int((self.completed / self.tests_count) * 100)
         except SkippedTestException as ex:
+            self.completed += 1
+            percent = int((self.completed / self.tests_count) * 100)
+            status = "skip"
+
             self.testcase.skipped += 1
-            print_test_result(
+            self.report(
                 TestResult(
                     percent=percent,
                     label=test_name,
-                    status="skip",
+                    name=name,
+                    status=status,
                     postmessage=str(ex),
                     comment=test._testamatonmeta.comment,
+                    duration=perf_counter() - started,
                 )
             )
-        except (AssertionError, TestError):
-            self.testcase.errors += 1
+        except Exception:  # noqa: BLE001
+            # Any exception raised by the test or its fixtures fails the test
+            self.completed += 1
+            percent = int((self.completed / self.tests_count) * 100)
 
             if isinstance(marker, ExpectFailMarkup):
-                print_test_result(
+                status = "error"
+                postmessage = marker.reason if marker.reason else "XFAIL"
+                self.testcase.errors += 1
+            elif quarantined:
+                status = "warning"
+                postmessage = "QUARANTINED"
+                self.testcase.warnings += 1
+            else:
+                status = "error"
+                postmessage = ""
+                self.testcase.errors += 1
+
+            self.report(
+                TestResult(
+                    percent=percent,
+                    label=test_name,
+                    name=name,
+                    status=status,
+                    output=traceback.format_exc(),
+                    postmessage=postmessage,
+                    comment=test._testamatonmeta.comment,
+                    captured=captured,
+                    duration=perf_counter() - started,
+                    blocked=usage.blocked if usage is not None else None,
+                )
+            )
+        else:
+            loop_issues = usage.describe() if usage is not None else None
+
+            if reruns:
+                status = "flaky"
+                self.testcase.flaky += 1
+                self.report(
+                    TestResult(
+                        percent=percent,
+                        label=test_name,
+                        name=name,
+                        status=status,
+                        output=failure,
+                        postmessage=f"passed on rerun {reruns}/{self.reruns}",
+                        comment=test._testamatonmeta.comment,
+                        duration=perf_counter() - started,
+                        blocked=usage.blocked if usage is not None else None,
+                    )
+                )
+            elif loop_issues:
+                status = "warning"
+                self.testcase.warnings += 1
+                self.report(
                     TestResult(
                         percent=percent,
                         label=test_name,
-                        status="error",
-                        output=traceback.format_exc(),
-                        postmessage=marker.reason if marker.reason else "XFAIL",
+                        name=name,
+                        status=status,
+                        output=loop_issues,
+                        postmessage=LOOP_WARNING,
                         comment=test._testamatonmeta.comment,
+                        duration=perf_counter() - started,
+                        blocked=usage.blocked,
                     )
                 )
             else:
-                print_test_result(
+                status = "success"
+                self.testcase.passed += 1
+                self.report(
                     TestResult(
                         percent=percent,
                         label=test_name,
-                        status="error",
-                        output=traceback.format_exc(),
+                        name=name,
                         comment=test._testamatonmeta.comment,
+                        duration=perf_counter() - started,
+                        blocked=usage.blocked if usage is not None else None,
                     )
                 )
-        else:
-            self.testcase.passed += 1
 
-            print_test_result(
-                TestResult(
-                    percent=percent,
-                    label=test_name,
-                    comment=test._testamatonmeta.comment,
+        if self.history is not None:
+            # Loop warnings are reported for tests that passed
+            passed = status == "warning" and loop_issues is not None
+            self.history.record(test.__name__, "success" if passed else status)
+
+        for hook in self.hooks.after_test:
+            hook(self, name, test, status)
+
+        if self.progress is not None:
+            self.progress.finished(name, test_name, perf_counter() - started)
+
+    def _ordered(self) -> List[str]:
+        """Test names with known-flaky tests scheduled last."""
+        if self.history is None:
+            return list(self.tests)
+
+        return self.history.order(self.tests)
+
+    async def _launch_concurrent(self, names: Optional[Iterable[str]] = None) -> None:
+        pool = ResourcePool(self.testcase.resources)
+        items = []
+
+        for test_num, test_name in enumerate(names or self._ordered(), start=1):
+            test = self.tests[test_name]
+            demands = normalize_resources(test._testamatonmeta.resources)
+            pool.validate(test_name, demands)
+            items.append(
+                (
+                    demands,
+                    partial(
+                        self._processing_tests_execution, test_num, test_name, test
+                    ),
                 )
             )
 
-    def launch_test_chain(self, tags: List[str]) -> None:
-        for test_num, (test_name, test) in enumerate(self.tests.items(), start=1):
-            self._processing_tests_execution(tags, test_num, test_name, test)
+        await schedule(items, self.concurrency, pool)
+
+    async def _launch_sequential(self, names: Optional[Iterable[str]] = None) -> None:
+        for test_num, test_name in enumerate(names or self._ordered(), start=1):
+            chunk = parse_chunk_item(test_name)
+
+            if chunk is None:
+                await self._processing_tests_execution(
+                    test_num, test_name, self.tests[test_name]
+                )
+            else:
+                name, start, end = chunk
+                test = self.tests[name]
+                await self._processing_tests_execution(
+                    test_num,
+                    test_name,
+                    test,
+                    test._testamatonmeta.arguments.slice(start, end),
+                )
+
+    def start_session(self) -> None:
+        self.loop = self.loop_factory()
+        asyncio.set_event_loop(self.loop)
+
+        if self.monitor is not None:
+            self.monitor.start(self.loop)
+        self.hooks = compile_hooks(
+            [*getattr(self.testcase, "plugins", ()), *self.plugins]
+        )
+        self.fixtures = FixtureManager(self.testcase.fixtures, self.hooks)
+
+        if self.hooks.result:
+            self.report = partial(_report_with_hooks, self.report, self.hooks.result)
+
+        if self.capture is not None:
+            self.capture.install()
+
+        for hook in self.hooks.session_start:
+            hook(self)
+
+    def finish_session(self) -> None:
+        try:
+            for hook in self.hooks.session_finish:
+                hook(self)
+
+            self.loop.run_until_complete(self.fixtures.teardown_session())
+        finally:
+            if self.monitor is not None:
+                self.monitor.stop()
+
+            self.snapshots.flush()
+
+            if self.history is not None:
+                self.history.save()
+
+            self.loop.run_until_complete(self.loop.shutdown_asyncgens())
+            asyncio.set_event_loop(None)
+            self.loop.close()
+
+            if self.capture is not None:
+                self.capture.uninstall()
+
+    def rebind(
+        self,
+        testcase: object,
+        tests: dict,
+        excluded: Optional[Set[str]] = None,
+    ) -> None:
+        """Point a started session at a reloaded suite, keeping loop and fixtures."""
+        self.testcase = testcase
+        self.tests = tests
+        self.tests_count = len(tests)
+        self.completed = 0
+
+        if excluded is not None:
+            self.excluded = excluded
+
+    def replace_fixtures(
+        self, fixtures: Dict[str, Fixture], changed: Iterable[str] = ()
+    ) -> None:
+        self.loop.run_until_complete(self.fixtures.replace(fixtures, changed))
+
+    def run_tests(self, names: Iterable[str]) -> None:
+        """Run a batch of tests inside an already started session."""
+        if self.concurrency > 1:
+            self.loop.run_until_complete(self._launch_concurrent(names))
+        else:
+            self.loop.run_until_complete(self._launch_sequential(names))
+
+    def launch_test_chain(self, live: bool = False) -> None:
+        if live:
+            self.progress = LiveProgress(
+                self.tests, concurrency=self.concurrency, history=self.durations
+            )
+            self.report = self.progress.report
+
+        self.start_session()
+
+        if self.progress is not None:
+            self.progress.__enter__()
+
+        try:
+            if self.concurrency > 1:
+                self.loop.run_until_complete(self._launch_concurrent())
+            else:
+                self.loop.run_until_complete(self._launch_sequential())
+        finally:
+            if self.progress is not None:
+                self.progress.__exit__(None, None, None)
+
+            self.finish_session()
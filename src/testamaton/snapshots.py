@@ -0,0 +1,214 @@
+import difflib
+import hashlib
+import inspect
+import json
+import mmap
+import os
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from testamaton.exceptions import TestError
+from testamaton.files import atomic_write, merge_json
+
+SNAPSHOT_DIR = "__snapshots__"
+DIFF_LINES = 50
+COMPARE_CHUNK = 1 << 16
+
+
+@dataclass
+class SnapshotScope:
+    session: "SnapshotSession"
+    test: Callable
+    case: Optional[int] = None
+    counter: int = 0
+    _index_path: Optional[Path] = None
+
+    @property
+    def index_path(self) -> Path:
+        if self._index_path is None:
+            source = Path(inspect.getsourcefile(inspect.unwrap(self.test)))
+            self._index_path = source.parent / SNAPSHOT_DIR / f"{source.stem}.json"
+
+        return self._index_path
+
+
+_current_scope: ContextVar[Optional[SnapshotScope]] = ContextVar(
+    "testamaton_snapshot", default=None
+)
+
+
+def serialize(value: Any) -> Tuple[str, bytes]:
+    """Stable serialization: raw bytes, UTF-8 text or sorted, indented JSON."""
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return "binary", bytes(value)
+    if isinstance(value, str):
+        return "text", value.encode("utf-8")
+
+    return "json", json.dumps(
+        value, sort_keys=True, indent=2, ensure_ascii=False, default=repr
+    ).encode("utf-8")
+
+
+def first_difference(path: Path, data: bytes) -> Optional[int]:
+    """Offset of the first byte where ``data`` and the file differ, via mmap."""
+    with open(path, "rb") as file:
+        size = os.fstat(file.fileno()).st_size
+
+        if size == 0:
+            return 0 if data else None
+
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            stored = memoryview(mapped)
+            current = memoryview(data)
+
+            try:
+                for offset in range(0, min(size, len(data)), COMPARE_CHUNK):
+                    end = offset + COMPARE_CHUNK
+                    if stored[offset:end] != current[offset:end]:
+                        for index in range(offset, min(end, size, len(data))):
+                            if stored[index] != current[index]:
+                                return index
+            finally:
+                stored.release()
+
+        return None if size == len(data) else min(size, len(data))
+
+
+@dataclass
+class SnapshotSession:
+    """
+    Content-addressed snapshot storage for one run.
+
+    ``__snapshots__/<module>.json`` maps snapshot keys to SHA-256 digests,
+    contents live once in ``__snapshots__/objects/<aa>/<digest>``. Checking an
+    unchanged snapshot only compares digests; stored contents are read only
+    to explain a mismatch. Index changes are merged into the files on flush.
+    """
+
+    update: bool = False
+    indexes: Dict[Path, Dict[str, Dict[str, Any]]] = field(default_factory=dict)
+    changes: Dict[Path, Dict[str, Dict[str, Any]]] = field(default_factory=dict)
+
+    def _index(self, path: Path) -> Dict[str, Dict[str, Any]]:
+        if path not in self.indexes:
+            try:
+                self.indexes[path] = json.loads(path.read_text("utf-8"))
+            except FileNotFoundError:
+                self.indexes[path] = {}
+
+        return self.indexes[path]
+
+    @staticmethod
+    def object_path(index_path: Path, digest: str) -> Path:
+        return index_path.parent / "objects" / digest[:2] / digest
+
+    def _write_object(self, index_path: Path, digest: str, data: bytes) -> None:
+        target = self.object_path(index_path, digest)
+
+        if target.exists():
+            return
+
+        atomic_write(target, data)
+
+    def _store(
+        self, index_path: Path, key: str, kind: str, data: bytes, digest: str
+    ) -> None:
+        self._write_object(index_path, digest, data)
+        entry = {"digest": digest, "size": len(data), "kind": kind}
+        self._index(index_path)[key] = entry
+        self.changes.setdefault(index_path, {})[key] = entry
+
+    def _explain(
+        self, index_path: Path, key: str, entry: Dict[str, Any], data: bytes
+    ) -> str:
+        stored_path = self.object_path(index_path, entry["digest"])
+        header = f"Snapshot '{key}' does not match ({stored_path})"
+
+        if not stored_path.exists():
+            return f"{header}: stored object is missing"
+
+        if entry["kind"] == "binary":
+            offset = first_difference(stored_path, data)
+            return (
+                f"{header}: {entry['size']} stored bytes vs {len(data)} current, "
+                f"first difference at byte {offset}"
+            )
+
+        diff = list(
+            difflib.unified_diff(
+                stored_path.read_text("utf-8").splitlines(),
+                data.decode("utf-8").splitlines(),
+                "snapshot",
+                "current",
+                lineterm="",
+            )
+        )
+
+        if len(diff) > DIFF_LINES:
+            diff = diff[:DIFF_LINES] + [f"... {len(diff) - DIFF_LINES} more lines"]
+
+        return "\n".join([header] + diff)
+
+    def check(self, index_path: Path, key: str, value: Any) -> bool:
+        kind, data = serialize(value)
+        digest = hashlib.sha256(data).hexdigest()
+        entry = self._index(index_path).get(key)
+
+        if entry is not None and entry["digest"] == digest:
+            return True
+
+        if entry is None or self.update:
+            self._store(index_path, key, kind, data, digest)
+            return True
+
+        raise TestError(self._explain(index_path, key, entry, data))
+
+    def flush(self) -> None:
+        for index_path, changes in self.changes.items():
+            merge_json(
+                index_path, lambda index, changes=changes: index.update(changes)
+            )
+
+        self.changes.clear()
+
+    def enter(self, test: Callable) -> Token:
+        return _current_scope.set(SnapshotScope(self, test))
+
+    @staticmethod
+    def leave(token: Token) -> None:
+        _current_scope.reset(token)
+
+
+def snapshot_case(case: Optional[int]) -> None:
+    """
+    Start a case of the running test: unnamed snapshots count from zero again.
+
+    ``case`` is the key of the argument case (its index, or its byte offset
+    in a file source), so repeated launches and byte-range chunks of a test
+    check the same snapshots as a full run.
+    """
+    scope = _current_scope.get()
+
+    if scope is not None:
+        scope.case = case
+        scope.counter = 0
+
+
+def assert_snapshot(value: Any, name: Optional[str] = None) -> bool:
+    scope = _current_scope.get()
+
+    if scope is None:
+        raise TestError("expect_snapshot can only be used inside a running test")
+
+    if name is None:
+        name = str(scope.counter)
+        scope.counter += 1
+
+    key = scope.test.__name__
+
+    if scope.case is not None:
+        key = f"{key}/{scope.case}"
+
+    return scope.session.check(scope.index_path, f"{key}/{name}", value)
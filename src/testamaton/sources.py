@@ -0,0 +1,246 @@
+import csv
+import json
+import mmap
+import os
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+from testamaton.exceptions import TestValidationError
+from testamaton.standard import Argument
+
+CHUNK_SEPARATOR = "@"
+
+
+def to_argument(value: Any) -> Argument:
+    """``Argument`` as is, list/tuple -> args, dict -> kwargs, else one arg."""
+    if isinstance(value, Argument):
+        return value
+    if isinstance(value, dict):
+        if value and set(value) <= {"args", "kwargs"}:
+            return Argument(
+                args=list(value.get("args", [])), kwargs=dict(value.get("kwargs", {}))
+            )
+        return Argument(kwargs=value)
+    if isinstance(value, (list, tuple)):
+        return Argument(args=list(value))
+
+    return Argument(args=[value])
+
+
+def chunk_item(name: str, start: int, end: int) -> str:
+    return f"{name}{CHUNK_SEPARATOR}{start}:{end}"
+
+
+def parse_chunk_item(item: str) -> Optional[Tuple[str, int, int]]:
+    name, separator, span = item.partition(CHUNK_SEPARATOR)
+
+    if not separator:
+        return None
+
+    start, _, end = span.partition(":")
+    return name, int(start), int(end)
+
+
+class ArgumentSource(ABC):
+    """
+    Lazy replacement for a tuple of ``Argument`` in ``TestCase.test``.
+
+    Cases are produced on demand each time the source is iterated, so a
+    suite with millions of cases never holds them all in memory.
+    """
+
+    @abstractmethod
+    def __iter__(self) -> Iterator[Argument]:
+        pass
+
+    def keyed(self) -> Iterator[Tuple[int, Argument]]:
+        """Cases with a key that identifies them within the whole source."""
+        return enumerate(self)
+
+    def __bool__(self) -> bool:
+        return True
+
+
+class GeneratorSource(ArgumentSource):
+    """
+    Cases from a callable returning an iterable, called anew for every pass.
+
+    A generator function keeps cases lazy; a function returning a list works
+    too, but builds all its cases at once on every pass.
+    """
+
+    def __init__(self, factory: Callable[[], Iterable[Any]]) -> None:
+        if not callable(factory):
+            raise TestValidationError(
+                "GeneratorSource needs a function, not a generator object"
+            )
+
+        self.factory = factory
+
+    def __iter__(self) -> Iterator[Argument]:
+        for value in self.factory():
+            yield to_argument(value)
+
+
+class FileSource(ArgumentSource):
+    """
+    Line-oriented file read through ``mmap``.
+
+    Only the pages that are actually iterated get loaded. ``chunks`` splits
+    the data into line-aligned byte ranges and ``slice`` reads one range,
+    which lets the distributed runner dispatch offsets instead of cases.
+    """
+
+    def __init__(
+        self, path: str, start: Optional[int] = None, end: Optional[int] = None
+    ) -> None:
+        self.path = os.path.abspath(path)
+        self.start = start
+        self.end = end
+
+    @contextmanager
+    def _mapped(self) -> Iterator[Optional[mmap.mmap]]:
+        with open(self.path, "rb") as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                yield None
+                return
+
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                yield mapped
+
+    def _data_start(self, mapped: mmap.mmap) -> int:
+        return 0
+
+    def _lines(self) -> Iterator[Tuple[int, bytes]]:
+        with self._mapped() as mapped:
+            if mapped is None:
+                return
+
+            position = self.start
+            if position is None:
+                position = self._data_start(mapped)
+            end = self.end if self.end is not None else len(mapped)
+
+            while position < end:
+                newline = mapped.find(b"\n", position, end)
+                if newline == -1:
+                    newline = end
+
+                line = mapped[position:newline]
+
+                if line.strip():
+                    yield position, line
+
+                position = newline + 1
+
+    @abstractmethod
+    def _parse(self, line: bytes) -> Argument:
+        pass
+
+    def __iter__(self) -> Iterator[Argument]:
+        for _, line in self._lines():
+            yield self._parse(line)
+
+    def keyed(self) -> Iterator[Tuple[int, Argument]]:
+        """Cases keyed by the byte offset of their line, the same in every slice."""
+        for offset, line in self._lines():
+            yield offset, self._parse(line)
+
+    def chunks(self, size: int = 1 << 20) -> Iterator[Tuple[int, int]]:
+        """Line-aligned ``(start, end)`` byte ranges of roughly ``size`` bytes."""
+        with self._mapped() as mapped:
+            if mapped is None:
+                return
+
+            position = self._data_start(mapped)
+            total = len(mapped)
+
+            while position < total:
+                end = min(position + size, total)
+
+                if end < total:
+                    newline = mapped.find(b"\n", end - 1)
+                    end = total if newline == -1 else newline + 1
+
+                yield position, end
+                position = end
+
+    def slice(self, start: int, end: int) -> "FileSource":
+        source = object.__new__(type(self))
+        source.__dict__.update(self.__dict__)
+        source.start, source.end = start, end
+        return source
+
+
+class JSONLSource(FileSource):
+    """One JSON value per line, converted with ``to_argument``."""
+
+    def _parse(self, line: bytes) -> Argument:
+        return to_argument(json.loads(line))
+
+
+class CSVSource(FileSource):
+    """
+    CSV rows as keyword arguments named after the header row.
+
+    Rows are split on newlines, so quoted fields must not contain them.
+    ``converters`` maps column names to callables applied to the raw strings.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        converters: Optional[Dict[str, Callable[[str], Any]]] = None,
+        encoding: str = "utf-8",
+        **fmtparams,
+    ) -> None:
+        super().__init__(path)
+        self.converters = converters or {}
+        self.encoding = encoding
+        self.fmtparams = fmtparams
+        self.fieldnames: List[str] = []
+
+        with self._mapped() as mapped:
+            if mapped is not None:
+                header = mapped[: self._data_start(mapped)].decode(encoding)
+                self.fieldnames = next(csv.reader([header.strip()], **fmtparams))
+
+    def _data_start(self, mapped: mmap.mmap) -> int:
+        newline = mapped.find(b"\n")
+        return len(mapped) if newline == -1 else newline + 1
+
+    def _parse(self, line: bytes) -> Argument:
+        text = line.decode(self.encoding).rstrip("\r")
+        row = next(csv.reader([text], **self.fmtparams))
+        kwargs = dict(zip(self.fieldnames, row, strict=False))
+
+        for name, converter in self.converters.items():
+            if name in kwargs:
+                kwargs[name] = converter(kwargs[name])
+
+        return Argument(kwargs=kwargs)
+
+
+def keyed_arguments(arguments: Iterable[Any]) -> Iterator[Tuple[int, Any]]:
+    if isinstance(arguments, ArgumentSource):
+        return arguments.keyed()
+
+    return enumerate(arguments)
+
+
+def as_argument_source(arguments: Any) -> Any:
+    """Wrap callables passed as ``arguments=``; other values pass through."""
+    if callable(arguments) and not isinstance(arguments, ArgumentSource):
+        return GeneratorSource(arguments)
+
+    return arguments
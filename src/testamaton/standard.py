@@ -118,6 +118,31 @@ class ExpectFailMarkup(Marker):
     name: str = "XFAIL"
 
 
+@dataclass
+class LoadProfile:
+    """
+    Load-test settings for an async test.
+
+    Attributes:
+           concurrency: Number of invocations kept in flight at the same time.
+           requests: Total number of invocations to issue (``None`` - unlimited).
+           duration: Wall-clock limit in seconds (``None`` - unlimited).
+           max_error_rate: Fail the test when the error rate exceeds this fraction
+                   (any error by default, ``None`` - never).
+    """
+
+    concurrency: int = 1
+    requests: Optional[int] = None
+    duration: Optional[float] = None
+    max_error_rate: Optional[float] = 0.0
+
+    def __post_init__(self) -> None:
+        if self.concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        if self.requests is None and self.duration is None:
+            raise ValueError("LoadProfile requires requests or duration limit")
+
+
 @dataclass
 class CollectionMetadata:
     marker: Optional[Marker] = None
@@ -125,6 +150,8 @@ class CollectionMetadata:
     tags: list = field(default_factory=list)
     arguments: list = field(default_factory=list)
     count_of_launchs: int = 1
+    load: Optional[LoadProfile] = None
+    resources: Union[list, dict] = field(default_factory=dict)
     is_fixture: bool = False
     fixture_scope: Optional[FixtureScope] = None
     fixture_autouse: bool = False
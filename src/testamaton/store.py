@@ -0,0 +1,418 @@
+import hashlib
+import os
+import platform
+import queue
+import re
+import sqlite3
+import subprocess
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from time import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from testamaton.hooks import Plugin
+
+STORE_PATH = os.path.join(".testamaton", "results.db")
+BATCH_SIZE = 500
+MESSAGE_LENGTH = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    label TEXT,
+    started REAL,
+    finished REAL,
+    revision TEXT,
+    platform TEXT,
+    version TEXT,
+    release TEXT,
+    system TEXT,
+    python TEXT,
+    total INTEGER,
+    passed INTEGER,
+    errors INTEGER,
+    warnings INTEGER,
+    skipped INTEGER,
+    flaky INTEGER,
+    duration REAL
+);
+CREATE TABLE IF NOT EXISTS results (
+    run_id INTEGER NOT NULL REFERENCES runs (id),
+    name TEXT NOT NULL,
+    label TEXT,
+    status TEXT,
+    duration REAL,
+    signature TEXT,
+    message TEXT
+);
+CREATE INDEX IF NOT EXISTS results_name ON results (name, run_id);
+CREATE INDEX IF NOT EXISTS results_run ON results (run_id);
+"""
+
+FAILED = ("error", "warning", "flaky")
+
+_FRAME = re.compile(r'File "([^"]+)", line \d+, in (\S+)')
+_VOLATILE = re.compile(r"0x[0-9a-fA-F]+|\d+(\.\d+)?")
+
+
+def _revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def failure_signature(output: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Signature and message of a failure traceback.
+
+    The signature hashes the innermost frame (file and function, not the line)
+    and the exception line with numbers and addresses masked, so the same
+    failure keeps its signature across edits and differing values.
+    """
+    if not output:
+        return None, None
+
+    lines = [line for line in str(output).splitlines() if line.strip()]
+
+    if not lines:
+        return None, None
+
+    frames = _FRAME.findall(str(output))
+    frame = f"{os.path.basename(frames[-1][0])}:{frames[-1][1]}" if frames else ""
+    last_frame = max(
+        (index for index, line in enumerate(lines) if _FRAME.search(line)),
+        default=-1,
+    )
+    # The exception starts at the first unindented line after the last frame
+    message = next(
+        (line for line in lines[last_frame + 1 :] if not line[0].isspace()),
+        lines[-1],
+    ).strip()
+    normalized = _VOLATILE.sub("#", message)
+    digest = hashlib.sha1(f"{frame}|{normalized}".encode()).hexdigest()
+
+    return digest[:12], message[:MESSAGE_LENGTH]
+
+
+@dataclass
+class RunSummary:
+    id: int
+    label: Optional[str]
+    started: float
+    revision: Optional[str]
+    total: Optional[int]
+    passed: Optional[int]
+    errors: Optional[int]
+    flaky: Optional[int]
+    duration: Optional[float]
+
+
+@dataclass
+class DurationTrend:
+    name: str
+    runs: int
+    first: float
+    last: float
+    slope: float
+
+
+@dataclass
+class FailureFrequency:
+    name: str
+    runs: int
+    failures: int
+    signature: Optional[str]
+    message: Optional[str]
+
+    @property
+    def rate(self) -> float:
+        return self.failures / self.runs if self.runs else 0.0
+
+
+def _slope(values: List[float]) -> float:
+    """Least-squares growth of ``values`` per step."""
+    count = len(values)
+    mean_x = (count - 1) / 2
+    mean_y = sum(values) / count
+    spread = sum((x - mean_x) ** 2 for x in range(count))
+
+    if not spread:
+        return 0.0
+
+    return sum((x - mean_x) * (y - mean_y) for x, y in enumerate(values)) / spread
+
+
+class ResultStore:
+    """
+    Local SQLite database of run metadata and per-test outcomes.
+
+    Written by ``ResultRecorder``; the query methods read it and return
+    nothing while the database does not exist yet. ``label`` narrows queries
+    to the runs of one ``TestCase``.
+    """
+
+    def __init__(self, path: str = STORE_PATH) -> None:
+        self.path = path
+
+    def connect(self) -> sqlite3.Connection:
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        connection = sqlite3.connect(self.path, timeout=30)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.executescript(SCHEMA)
+        return connection
+
+    def _query(self, sql: str, parameters: Dict[str, Any]) -> List[Tuple]:
+        if not os.path.exists(self.path):
+            return []
+
+        connection = self.connect()
+
+        try:
+            return connection.execute(sql, parameters).fetchall()
+        finally:
+            connection.close()
+
+    @staticmethod
+    def _recent_runs(label: Optional[str]) -> str:
+        where = "WHERE label = :label" if label is not None else ""
+        return f"SELECT id FROM runs {where} ORDER BY id DESC LIMIT :runs"
+
+    def durations(
+        self, runs: int = 5, label: Optional[str] = None
+    ) -> Dict[str, float]:
+        """Average duration of passing tests over the last ``runs`` runs."""
+        rows = self._query(
+            f"""
+            SELECT name, AVG(duration) FROM results
+            WHERE run_id IN ({self._recent_runs(label)})
+              AND duration IS NOT NULL AND status IN ('success', 'flaky')
+            GROUP BY name
+            """,
+            {"runs": runs, "label": label},
+        )
+        return dict(rows)
+
+    def trends(
+        self, limit: int = 10, label: Optional[str] = None
+    ) -> List[RunSummary]:
+        """The last ``limit`` runs, oldest first."""
+        rows = self._query(
+            f"""
+            SELECT id, label, started, revision, total, passed, errors, flaky,
+                   duration
+            FROM runs WHERE id IN ({self._recent_runs(label)}) ORDER BY id
+            """,
+            {"runs": limit, "label": label},
+        )
+        return [RunSummary(*row) for row in rows]
+
+    def slowest_growing(
+        self, runs: int = 10, limit: int = 10, label: Optional[str] = None
+    ) -> List[DurationTrend]:
+        """Tests whose duration grew the most per run over the last ``runs``."""
+        rows = self._query(
+            f"""
+            SELECT name, run_id, AVG(duration) FROM results
+            WHERE run_id IN ({self._recent_runs(label)})
+              AND duration IS NOT NULL AND status IN ('success', 'flaky')
+            GROUP BY name, run_id ORDER BY name, run_id
+            """,
+            {"runs": runs, "label": label},
+        )
+        series: Dict[str, List[float]] = {}
+
+        for name, _, duration in rows:
+            series.setdefault(name, []).append(duration)
+
+        trends = [
+            DurationTrend(name, len(values), values[0], values[-1], _slope(values))
+            for name, values in series.items()
+            if len(values) > 1
+        ]
+        trends.sort(key=lambda trend: trend.slope, reverse=True)
+        return [trend for trend in trends if trend.slope > 0][:limit]
+
+    def failure_frequency(
+        self, runs: int = 50, limit: int = 10, label: Optional[str] = None
+    ) -> List[FailureFrequency]:
+        """Tests failing most often over the last ``runs``, rerun passes included."""
+        rows = self._query(
+            f"""
+            SELECT name, status, signature, message FROM results
+            WHERE run_id IN ({self._recent_runs(label)}) AND status != 'skip'
+            """,
+            {"runs": runs, "label": label},
+        )
+        totals: Counter = Counter()
+        failures: Counter = Counter()
+        signatures: Dict[str, Counter] = {}
+        messages: Dict[str, str] = {}
+
+        for name, status, signature, message in rows:
+            totals[name] += 1
+
+            if status not in FAILED:
+                continue
+
+            failures[name] += 1
+
+            if signature is not None:
+                signatures.setdefault(name, Counter())[signature] += 1
+                messages[signature] = message
+
+        frequencies = []
+
+        for name, count in failures.most_common():
+            common = signatures.get(name)
+            signature = common.most_common(1)[0][0] if common else None
+            frequencies.append(
+                FailureFrequency(
+                    name, totals[name], count, signature, messages.get(signature)
+                )
+            )
+
+        frequencies.sort(key=lambda item: (item.rate, item.failures), reverse=True)
+        return frequencies[:limit]
+
+
+class ResultRecorder(Plugin):
+    """
+    Records the results of runs into a ``ResultStore``.
+
+    The ``result`` hook only puts the result on a queue; a writer thread owns
+    the connection, computes failure signatures and inserts queued results in
+    batched transactions. A run starts with the session or, when it
+    continues past a ``report``, with its next result; the ``report`` hook
+    ends it, so every watch-mode iteration is a run of its own.
+    """
+
+    def __init__(self, store: ResultStore, label: Optional[str] = None) -> None:
+        self.store = store
+        self.label = label
+        self.runs: int = 0
+        self._queue: queue.SimpleQueue[Optional[Tuple[str, Any]]] = (
+            queue.SimpleQueue()
+        )
+        self._thread: Optional[threading.Thread] = None
+
+    def _begin(self) -> None:
+        self._queue.put(("run", (self.label, time())))
+        self._thread = threading.Thread(
+            target=self._write, name="testamaton-result-store", daemon=True
+        )
+        self._thread.start()
+
+    def session_start(self, runner: Any) -> None:
+        if self._thread is None:
+            self._begin()
+
+    def result(self, result: Any) -> None:
+        if self._thread is None:
+            self._begin()
+
+        self._queue.put(
+            (
+                "result",
+                (
+                    result.name or result.label,
+                    result.label,
+                    result.status,
+                    result.duration,
+                    result.output if result.status in FAILED else None,
+                ),
+            )
+        )
+
+    def report(self, testcase: Any, report: Any) -> None:
+        if self._thread is None:
+            return
+
+        self._queue.put(
+            (
+                "finish",
+                (
+                    time(),
+                    report.total,
+                    report.passed,
+                    report.errors,
+                    report.warnings,
+                    report.skipped,
+                    report.flaky,
+                ),
+            )
+        )
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+        self.runs += 1
+
+    def _write(self) -> None:
+        connection = self.store.connect()
+        run_id: Optional[int] = None
+        started: float = 0.0
+        stopped = False
+
+        try:
+            while not stopped:
+                batch = [self._queue.get()]
+
+                while len(batch) < BATCH_SIZE:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+
+                with connection:
+                    for item in batch:
+                        if item is None:
+                            stopped = True
+                            break
+
+                        kind, values = item
+
+                        if kind == "run":
+                            label, started = values
+                            run_id = connection.execute(
+                                """
+                                INSERT INTO runs (label, started, revision,
+                                    platform, version, release, system, python)
+                                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                                """,
+                                (
+                                    label,
+                                    started,
+                                    _revision(),
+                                    platform.platform(),
+                                    platform.version(),
+                                    platform.release(),
+                                    platform.system(),
+                                    platform.python_version(),
+                                ),
+                            ).lastrowid
+                        elif kind == "result":
+                            name, label, status, duration, output = values
+                            connection.execute(
+                                "INSERT INTO results VALUES (?, ?, ?, ?, ?, ?, ?)",
+                                (run_id, name, label, status, duration)
+                                + failure_signature(output),
+                            )
+                        else:
+                            finished, *totals = values
+                            connection.execute(
+                                """
+                                UPDATE runs SET finished = ?, total = ?,
+                                    passed = ?, errors = ?, warnings = ?,
+                                    skipped = ?, flaky = ?, duration = ?
+                                WHERE id = ?
+                                """,
+                                (finished, *totals, finished - started, run_id),
+                            )
+        finally:
+            connection.close()
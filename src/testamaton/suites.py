@@ -0,0 +1,43 @@
+import importlib
+import importlib.util
+import os
+import sys
+from types import ModuleType
+from typing import Tuple
+
+from testamaton.exceptions import TestValidationError
+
+
+def import_suite(spec: str) -> Tuple[ModuleType, str]:
+    """
+    Import the module of ``path/to/suite.py:name`` or ``package.module:name``.
+
+    Files are imported as regular modules registered in ``sys.modules``, so
+    watch mode can reload them later. Importing runs the module body, so
+    suites must keep their ``run()`` call under an
+    ``if __name__ == "__main__":`` guard.
+    """
+    location, _, attribute = spec.rpartition(":")
+
+    if not location or not attribute:
+        raise TestValidationError(f"Invalid suite spec '{spec}', expected 'path:name'")
+
+    if not (location.endswith(".py") or os.sep in location):
+        return importlib.import_module(location), attribute
+
+    path = os.path.abspath(location)
+    directory, filename = os.path.split(path)
+    name = os.path.splitext(filename)[0]
+
+    if directory not in sys.path:
+        sys.path.insert(0, directory)
+
+    module = sys.modules.get(name)
+
+    if module is None or os.path.abspath(getattr(module, "__file__", "")) != path:
+        spec_ = importlib.util.spec_from_file_location(name, path)
+        module = importlib.util.module_from_spec(spec_)
+        sys.modules[name] = module
+        spec_.loader.exec_module(module)
+
+    return module, attribute
@@ -1,19 +1,47 @@
+import asyncio
+import os
+import sys
 from functools import partial, wraps
 from logging import Logger, getLogger
 from time import time
-from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
-
-from testamaton.exceptions import TestError
-from testamaton.reporter import print_header, print_results_table, TestsExeecutionReport
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple, Union
+
+from testamaton.diff import describe_difference, first_not_close, short_repr
+from testamaton.distributed import Record, coordinate
+from testamaton.exceptions import TestError, TestValidationError
+from testamaton.flaky import HISTORY_PATH, FlakyHistory, history_status
+from testamaton.hooks import NO_HOOKS, Hooks, compile_hooks, implements
+from testamaton.http import builtin_fixtures
+from testamaton.loops import LoopFactory
+from testamaton.reporter import (
+    TestResult,
+    TestsExeecutionReport,
+    print_header,
+    print_results_table,
+    print_test_result,
+    print_usage_report,
+)
+from testamaton.selection import excluded_by_tags, select_tests
 from testamaton.sessions import Runner
+from testamaton.snapshots import assert_snapshot
+from testamaton.sources import (
+    ArgumentSource,
+    as_argument_source,
+    chunk_item,
+    parse_chunk_item,
+)
 from testamaton.standard import (
     Argument,
     CollectionMetadata,
     Each,
     ExpectFailMarkup,
     Fixture,
+    FixtureScope,
+    LoadProfile,
     SkipMarker,
 )
+from testamaton.store import STORE_PATH, ResultRecorder, ResultStore
+from testamaton.usage import USAGE_PATH, UsageSampler
 
 __tlogger: Logger = getLogger(__name__)
 
@@ -79,51 +107,103 @@ class BaseTestCase:
 
         self.warnings: int = 0
         self.tags: List[str] = []
-        self.fixtures: Dict[str, Fixture] = []
+        self.tag_index: Dict[str, Set[str]] = {}
+        self.test_order: Dict[str, int] = {}
+        self.resources: Dict[str, int] = {}
+        self.fixtures: Dict[str, Fixture] = builtin_fixtures()
+        self.plugins: List[Any] = []
+        self.hooks: Hooks = NO_HOOKS
         self.skipped: int = 0
         self.errors: int = 0
         self.passed: int = 0
+        self.flaky: int = 0
 
         self.tests: Dict[str, Union[Callable, Awaitable]] = {}
 
+    def reset_counters(self) -> None:
+        """Zero the outcome counters before a new run."""
+        self.passed = self.errors = self.skipped = 0
+        self.warnings = self.flaky = 0
+
 
 class TestCase(BaseTestCase):
     def __init__(self, label: str = "TestCase") -> None:
         super().__init__(label)
 
-    def fixture(self) -> Callable:
-        def wrapper(
-            func: Union[Awaitable, Callable], *args, **kwargs
-        ) -> Union[Awaitable, Callable]:
+    def fixture(
+        self,
+        scope: FixtureScope = FixtureScope.FUNCTION,
+        autouse: bool = False,
+        name: Optional[str] = None,
+    ) -> Callable:
+        def wrapper(func: Union[Awaitable, Callable]) -> Union[Awaitable, Callable]:
             if not hasattr(func, "_testamatonmeta"):
                 func._testamatonmeta = CollectionMetadata(is_fixture=True)
             else:
                 func._testamatonmeta.is_fixture = True
 
-            self.fixtures[func.__name__] = Fixture(handler=func)
+            func._testamatonmeta.fixture_scope = scope
+            func._testamatonmeta.fixture_autouse = autouse
 
-            __tlogger.warning("Fixtures not fully implemented")
+            fixture_name = name or func.__name__
+            self.fixtures[fixture_name] = Fixture(
+                handler=func, scope=scope, name=fixture_name, autouse=autouse
+            )
 
-            return func(*args, **kwargs)
+            return func
 
         return wrapper
 
+    def plugin(self, plugin: Any) -> Any:
+        """
+        Register a plugin, an object implementing some ``hooks.Plugin`` methods.
+
+        Its ``collect`` hook is replayed for tests registered before it.
+        """
+        self.plugins.append(plugin)
+        self.hooks = compile_hooks(self.plugins)
+
+        if implements(plugin, "collect"):
+            for name, func in self.tests.items():
+                plugin.collect(self, name, func)
+
+        return plugin
+
+    def resource(self, name: str, capacity: int = 1) -> None:
+        """Declare a resource group that at most ``capacity`` units may hold at once."""
+        if capacity < 1:
+            raise ValueError(f"Capacity of resource '{name}' must be at least 1")
+
+        self.resources[name] = capacity
+
     def test(
         self,
-        comment: str = None,
-        tags: List[str] = [],
+        comment: Optional[str] = None,
+        tags: Optional[List[str]] = None,
         count_of_launchs: int = 1,
-        arguments: Tuple[Argument] = (),
+        arguments: Union[Tuple[Argument], ArgumentSource, Callable] = (),
+        load: Optional[LoadProfile] = None,
+        resources: Union[List[str], Dict[str, int], None] = None,
     ) -> Callable:
+        tags = tags or []
+        resources = resources or {}
+        arguments = as_argument_source(arguments)
+
         def wrapper(
             func: Union[Awaitable, Callable], *args, **kwargs
         ) -> Union[Awaitable, Callable]:
+            # Read before the metadata below is overwritten
+            registered = self.tests.get(func.__name__)
+            previous = [] if registered is None else registered._testamatonmeta.tags
+
             if not hasattr(func, "_testamatonmeta"):
                 func._testamatonmeta = CollectionMetadata(
                     comment=comment.format(**kwargs) if comment is not None else None,
                     tags=tags,
                     arguments=arguments,
                     count_of_launchs=count_of_launchs,
+                    load=load,
+                    resources=resources,
                 )
             else:
                 func._testamatonmeta.comment = (
@@ -132,45 +212,402 @@ class TestCase(BaseTestCase):
                 func._testamatonmeta.tags = tags
                 func._testamatonmeta.arguments = arguments
                 func._testamatonmeta.count_of_launchs = count_of_launchs
+                func._testamatonmeta.load = load
+                func._testamatonmeta.resources = resources
 
-            self.tags = list(set(self.tags + tags))
+            self._index_tags(func.__name__, previous, tags)
 
             self.tests[func.__name__] = func
+            self.test_order.setdefault(func.__name__, len(self.test_order))
+
+            for hook in self.hooks.collect:
+                hook(self, func.__name__, func)
+
             return func
 
         return wrapper
 
-    def run(self, tags: Optional[List[str]] = []) -> None:
-        runner = Runner(self.tests, self)
+    def _index_tags(self, name: str, previous: List[str], tags: List[str]) -> None:
+        for tag in previous:
+            self.tag_index.get(tag, set()).discard(name)
+
+        for tag in tags:
+            if tag not in self.tag_index:
+                self.tag_index[tag] = set()
+                self.tags.append(tag)
+
+            self.tag_index[tag].add(name)
+
+    def run(
+        self,
+        tags: Optional[List[str]] = None,
+        concurrency: int = 1,
+        select: Optional[str] = None,
+        names: Optional[List[str]] = None,
+        capture: bool = True,
+        live: Optional[bool] = None,
+        update_snapshots: Optional[bool] = None,
+        reruns: int = 0,
+        quarantine: bool = False,
+        history: Union[bool, str] = False,
+        loop: Union[str, LoopFactory, None] = None,
+        slow_callback: Optional[float] = None,
+        sample_usage: Union[bool, str] = False,
+        sample_interval: float = 0.5,
+        store: Union[bool, str] = False,
+    ) -> None:
+        """
+        Run the collected tests.
+
+        ``tags`` skips tests carrying any of the given tags, ``select`` keeps
+        tests matching a tag expression (``"db and not slow"``) and ``names``
+        keeps tests whose name contains a substring or matches a glob.
+        Output of each test is captured and only shown when it fails.
+        ``live`` (on by default for concurrent runs) replaces per-test lines
+        with a throttled status region that prints only failures and warnings.
+        ``update_snapshots`` (or ``TESTAMATON_UPDATE_SNAPSHOTS=1``) rewrites
+        snapshots that no longer match instead of failing.
+        A failing test is rerun in place up to ``reruns`` times and reported
+        as flaky when a rerun passes. With ``history`` (``True`` or a JSON
+        path) outcomes are kept across runs; known-flaky tests run last and,
+        with ``quarantine`` (which implies ``history``), their failures are
+        reported as warnings.
+        ``loop`` picks the event loop (``"asyncio"``, ``"uvloop"``, ``"auto"``
+        or a factory). With ``slow_callback`` set (seconds), loop-blocked time
+        is measured for async tests; stalls above it and tasks left pending
+        turn a pass into a warning.
+        ``sample_usage`` (``True`` or a CSV path) samples CPU, RSS, open files,
+        threads and loop lag every ``sample_interval`` seconds and adds their
+        peak and average, with the tests running at the peak, to the summary.
+        ``store`` (``True`` or a database path) records the run and its results
+        in the SQLite result store, whose recent durations feed the live ETA.
+        """
+        self.reset_counters()
+        tests = select_tests(
+            self.tests, self.tag_index, select, names, self.test_order
+        )
+        recorder = self._recorder(store)
+        sampler = (
+            UsageSampler(
+                USAGE_PATH if sample_usage is True else sample_usage, sample_interval
+            )
+            if sample_usage
+            else None
+        )
+        runner = Runner(
+            tests,
+            self,
+            concurrency=concurrency,
+            excluded=excluded_by_tags(self.tag_index, tags or []),
+            capture=capture,
+            update_snapshots=_update_snapshots(update_snapshots),
+            reruns=reruns,
+            history=_flaky_history(history or quarantine),
+            quarantine=quarantine,
+            loop_factory=loop,
+            slow_callback=slow_callback,
+            plugins=[plugin for plugin in (sampler, recorder) if plugin],
+            durations=(
+                recorder.store.durations(label=self.label) if recorder else None
+            ),
+        )
 
         start: float = time()
 
-        runner.launch_test_chain(tags=tags)
+        runner.launch_test_chain(live=concurrency > 1 if live is None else live)
 
         end: float = time()
-        total: float = end - start
+        report = self._print_summary(len(tests), end - start)
+
+        if recorder is not None:
+            recorder.report(self, report)
+
+        if sampler is not None:
+            print_usage_report(sampler.summary)
+
+    def _recorder(self, store: Union[bool, str]) -> Optional[ResultRecorder]:
+        if not store:
+            return None
+
+        return ResultRecorder(
+            ResultStore(STORE_PATH if store is True else store), self.label
+        )
 
+    def _print_summary(self, total_tests: int, total: float) -> TestsExeecutionReport:
         print_header(
-            f"[cyan]{len(self.tests)} tests runned {round(total, 2)}s[/cyan]",
+            f"[cyan]{total_tests} tests runned {round(total, 2)}s[/cyan]",
             plus_len=15,
         )
 
-        print_results_table(
-            TestsExeecutionReport(
-                total=len(self.tests),
-                passed=self.passed,
-                warnings=self.warnings,
-                errors=self.errors,
-                skipped=self.skipped,
-            )
+        report = TestsExeecutionReport(
+            total=total_tests,
+            passed=self.passed,
+            warnings=self.warnings,
+            errors=self.errors,
+            skipped=self.skipped,
+            flaky=self.flaky,
         )
+        print_results_table(report)
+
+        for hook in self.hooks.report:
+            hook(self, report)
+
+        return report
+
+    def _suite_spec(self) -> str:
+        main = sys.modules.get("__main__")
+
+        for name, value in vars(main).items():
+            if value is self and getattr(main, "__file__", None):
+                return f"{os.path.abspath(main.__file__)}:{name}"
+
+        raise TestValidationError(
+            "Cannot locate TestCase in __main__, pass suite='path/to/suite.py:name'"
+        )
+
+    def run_distributed(
+        self,
+        address: str = "127.0.0.1:0",
+        workers: int = 2,
+        suite: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        select: Optional[str] = None,
+        names: Optional[List[str]] = None,
+        capture: bool = True,
+        update_snapshots: Optional[bool] = None,
+        batch_size: int = 32,
+        chunk_size: int = 1 << 20,
+        reruns: int = 0,
+        history: Union[bool, str] = False,
+        loop: Optional[str] = None,
+        slow_callback: Optional[float] = None,
+        store: Union[bool, str] = False,
+    ) -> None:
+        """
+        Run tests on worker processes pulling batches from a local coordinator.
+
+        ``workers`` local agents are spawned, more can connect to ``address``
+        (``host:port`` or ``unix:/path``) with
+        ``python -m testamaton.distributed --connect ADDRESS``. Workers import
+        ``suite`` themselves, so the module must guard its ``run`` call with
+        ``if __name__ == "__main__":``. Tests fed by file sources are split
+        into ``chunk_size`` byte ranges that are dispatched as separate items.
+        Workers rerun failures ``reruns`` times; with ``history`` outcomes are
+        recorded as with ``run`` and known-flaky tests are dispatched last.
+        ``loop`` and ``slow_callback`` are passed on to the workers' runners.
+        Merged results are recorded in the result ``store`` as with ``run``.
+        """
+        self.reset_counters()
+        tests = select_tests(
+            self.tests, self.tag_index, select, names, self.test_order
+        )
+        recorder = self._recorder(store)
+        excluded = excluded_by_tags(self.tag_index, tags or [])
+        flaky_history = _flaky_history(history)
+        items: List[str] = []
+        chunk_counts: Dict[str, int] = {}
+        chunk_records: Dict[str, List[Record]] = {}
+
+        if flaky_history is not None:
+            tests = {name: tests[name] for name in flaky_history.order(tests)}
+
+        for name, test in tests.items():
+            source = test._testamatonmeta.arguments
+
+            if hasattr(source, "chunks") and name not in excluded:
+                chunks = [
+                    chunk_item(name, start, end)
+                    for start, end in source.chunks(chunk_size)
+                ]
+
+                if chunks:
+                    chunk_counts[name] = len(chunks)
+
+                items.extend(chunks or [name])
+            else:
+                items.append(name)
+
+        completed: int = 0
+
+        def merge(record: Record) -> None:
+            nonlocal completed
+            chunk = parse_chunk_item(record[0])
+
+            if chunk is not None:
+                records = chunk_records.setdefault(chunk[0], [])
+                records.append(record)
+
+                if len(records) < chunk_counts[chunk[0]]:
+                    return
+
+                record = _merge_chunk_records(chunk[0], chunk_records.pop(chunk[0]))
+
+            name, label, status, duration, output, postmessage, comment, captured = (
+                record
+            )
+            completed += 1
+
+            if flaky_history is not None:
+                flaky_history.record(name, history_status(status, postmessage))
+
+            if status == "success":
+                self.passed += 1
+            elif status == "flaky":
+                self.flaky += 1
+            elif status == "warning":
+                self.warnings += 1
+            elif status == "skip":
+                self.skipped += 1
+            else:
+                self.errors += 1
+
+            result = TestResult(
+                percent=int((completed / len(tests)) * 100),
+                label=label,
+                status=status,
+                output=output,
+                postmessage=postmessage,
+                comment=comment,
+                captured=captured,
+                duration=duration,
+                name=name,
+            )
+            print_test_result(result)
+
+            if recorder is not None:
+                recorder.result(result)
+
+            for hook in self.hooks.result:
+                hook(result)
+
+        hello = {
+            "suite": suite or self._suite_spec(),
+            "excluded": sorted(excluded),
+            "capture": capture,
+            "update_snapshots": _update_snapshots(update_snapshots),
+            "reruns": reruns,
+            "loop": loop,
+            "slow_callback": slow_callback,
+        }
+
+        start: float = time()
+
+        try:
+            asyncio.run(
+                coordinate(
+                    items,
+                    merge,
+                    hello,
+                    address=address,
+                    workers=workers,
+                    batch_size=batch_size,
+                )
+            )
+        finally:
+            if flaky_history is not None:
+                flaky_history.save()
+
+        end: float = time()
+        report = self._print_summary(len(tests), end - start)
+
+        if recorder is not None:
+            recorder.report(self, report)
+
+
+# Chunk outcomes of one test, least to most severe
+CHUNK_STATUSES = ("skip", "success", "flaky", "warning", "error")
+
+
+def _merge_chunk_records(name: str, records: List[Record]) -> Record:
+    """One record for a test from the records of its byte-range chunks."""
+    records.sort(key=lambda record: parse_chunk_item(record[0])[1])
+    status = max(
+        (record[2] for record in records),
+        key=lambda status: (
+            CHUNK_STATUSES.index(status) if status in CHUNK_STATUSES else 0
+        ),
+    )
+    failed = [record for record in records if record[2] != "success"]
+    label = records[0][1].replace(records[0][0], name, 1)
+
+    def joined(index: int) -> Optional[str]:
+        parts = [
+            f"[{record[0]}]\n{record[index]}" for record in failed if record[index]
+        ]
+        return "\n".join(parts) or None
+
+    return [
+        name,
+        label,
+        status,
+        sum(record[3] or 0.0 for record in records),
+        joined(4),
+        "; ".join(dict.fromkeys(record[5] for record in failed if record[5])),
+        records[0][6],
+        joined(7),
+    ]
 
 
 def expect(lhs: Any, rhs: Any, message: str) -> bool:
     if lhs == rhs:
         return True
     else:
-        raise TestError(message)
+        difference = describe_difference(lhs, rhs)
+        raise TestError(f"{message}\n{difference}" if difference else message)
+
+
+def expect_equal(lhs: Any, rhs: Any, message: Optional[str] = None) -> bool:
+    """``expect`` for large containers and buffers, locating the first difference."""
+    if lhs == rhs:
+        return True
+
+    difference = describe_difference(lhs, rhs) or (
+        f"{short_repr(lhs)} != {short_repr(rhs)}"
+    )
+    raise TestError(f"{message}\n{difference}" if message else difference)
+
+
+def expect_close(
+    lhs: Any,
+    rhs: Any,
+    rel_tol: float = 1e-9,
+    abs_tol: float = 0.0,
+    message: Optional[str] = None,
+) -> bool:
+    """Element-wise tolerance comparison of numeric sequences and buffers."""
+    index = first_not_close(lhs, rhs, rel_tol=rel_tol, abs_tol=abs_tol)
+
+    if index is None:
+        return True
+
+    if index >= min(len(lhs), len(rhs)):
+        difference = f"length {len(lhs)} vs {len(rhs)}"
+    else:
+        difference = (
+            f"index {index}: {lhs[index]!r} vs {rhs[index]!r} "
+            f"(rel_tol={rel_tol}, abs_tol={abs_tol})"
+        )
+
+    raise TestError(f"{message}\n{difference}" if message else difference)
+
+
+def expect_snapshot(value: Any, name: Optional[str] = None) -> bool:
+    """Compare ``value`` with its stored snapshot, storing it on the first run."""
+    return assert_snapshot(value, name)
+
+
+def _flaky_history(history: Union[bool, str]) -> Optional[FlakyHistory]:
+    if not history:
+        return None
+
+    return FlakyHistory(HISTORY_PATH if history is True else history)
+
+
+def _update_snapshots(update: Optional[bool]) -> bool:
+    if update is None:
+        return os.environ.get("TESTAMATON_UPDATE_SNAPSHOTS", "") not in ("", "0")
+
+    return update
 
 
 def each(*args) -> Each:
@@ -0,0 +1,207 @@
+import os
+import threading
+from contextlib import suppress
+from dataclasses import dataclass, field
+from time import perf_counter, process_time
+from typing import IO, Any, Callable, Dict, Optional, Tuple
+
+from testamaton.hooks import Plugin
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None
+
+USAGE_PATH = os.path.join(".testamaton", "usage.csv")
+METRICS = ("cpu_percent", "rss_mb", "fds", "threads", "loop_lag_ms")
+SHOWN_TESTS = 3
+
+
+def _rss_bytes() -> Optional[int]:
+    try:
+        with open("/proc/self/statm", "rb") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+
+    if resource is None:
+        return None
+
+    # Peak instead of current RSS; kilobytes on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if os.uname().sysname == "Darwin" else peak * 1024
+
+
+def _open_fds() -> Optional[int]:
+    for directory in ("/proc/self/fd", "/dev/fd"):
+        try:
+            return len(os.listdir(directory))
+        except OSError:
+            continue
+
+    return None
+
+
+@dataclass
+class MetricSummary:
+    name: str
+    total: float = 0.0
+    count: int = 0
+    peak: Optional[float] = None
+    peak_at: float = 0.0
+    peak_tests: Tuple[str, ...] = ()
+
+    @property
+    def average(self) -> Optional[float]:
+        return self.total / self.count if self.count else None
+
+    def add(self, value: Optional[float], at: float, tests: Tuple[str, ...]) -> None:
+        if value is None:
+            return
+
+        self.total += value
+        self.count += 1
+
+        if self.peak is None or value > self.peak:
+            self.peak, self.peak_at, self.peak_tests = value, at, tests
+
+
+@dataclass
+class UsageSummary:
+    samples: int = 0
+    interval: float = 0.0
+    path: Optional[str] = None
+    metrics: Dict[str, MetricSummary] = field(
+        default_factory=lambda: {name: MetricSummary(name) for name in METRICS}
+    )
+
+
+class UsageSampler(Plugin):
+    """
+    Samples process resource usage on a background thread during a run.
+
+    Every ``interval`` seconds CPU usage, RSS, open file descriptors, thread
+    count and event-loop lag are recorded along with the tests that were
+    running during the interval, appended to a CSV time series at ``path``
+    and folded into running peak/average summaries. Loop lag is the delay of
+    a callback posted to the runner loop from the sampling thread; it is
+    charged to the tests running when the callback was posted.
+    """
+
+    def __init__(self, path: Optional[str] = USAGE_PATH, interval: float = 0.5) -> None:
+        self.path = path
+        self.interval = interval
+        self.summary = UsageSummary(interval=interval, path=path)
+        self.running: Dict[str, None] = {}
+        self.seen: Dict[str, None] = {}
+        self.loop: Any = None
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._file: Optional[IO[str]] = None
+        self._lag: Optional[Tuple[float, Tuple[str, ...]]] = None
+        self._started: float = 0.0
+        self._cpu: Tuple[float, float] = (0.0, 0.0)
+
+    def session_start(self, runner: Any) -> None:
+        self.loop = runner.loop
+        self._started = perf_counter()
+        self._cpu = (self._started, process_time())
+
+        if self.path is not None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            # Kept open for the whole session, closed in session_finish
+            self._file = open(self.path, "w", encoding="utf-8")  # noqa: SIM115
+            self._file.write(",".join(("time",) + METRICS + ("running", "tests")))
+            self._file.write("\n")
+
+        self._stopped.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="testamaton-usage-sampler", daemon=True
+        )
+        self._thread.start()
+
+    def session_finish(self, runner: Any) -> None:
+        self._stopped.set()
+
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+        self.sample()
+
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def before_test(self, runner: Any, name: str, test: Callable) -> None:
+        with self._lock:
+            self.running[name] = None
+            self.seen[name] = None
+
+    def after_test(self, runner: Any, name: str, test: Callable, status: str) -> None:
+        with self._lock:
+            self.running.pop(name, None)
+
+    def _probe(self, posted: float, tests: Tuple[str, ...]) -> None:
+        self._lag = (perf_counter() - posted, tests)
+
+    def _post_probe(self) -> None:
+        loop = self.loop
+
+        if loop is None or not loop.is_running():
+            return
+
+        with self._lock:
+            tests = tuple(self.running)[:SHOWN_TESTS]
+
+        # The loop may close between the check above and the call
+        with suppress(RuntimeError):
+            loop.call_soon_threadsafe(self._probe, perf_counter(), tests)
+
+    def sample(self) -> None:
+        now = perf_counter()
+        cpu = process_time()
+        wall = now - self._cpu[0]
+        cpu_percent = (cpu - self._cpu[1]) / wall * 100 if wall > 0 else 0.0
+        self._cpu = (now, cpu)
+
+        rss = _rss_bytes()
+        lag = self._lag
+        self._lag = None
+
+        with self._lock:
+            running = tuple(self.running)
+            seen = tuple(self.seen)
+            self.seen = dict.fromkeys(running)
+
+        values = {
+            "cpu_percent": cpu_percent,
+            "rss_mb": rss / (1 << 20) if rss is not None else None,
+            "fds": _open_fds(),
+            "threads": threading.active_count(),
+            "loop_lag_ms": lag[0] * 1000 if lag is not None else None,
+        }
+        at = now - self._started
+        shown = seen[:SHOWN_TESTS]
+
+        self.summary.samples += 1
+
+        for name, value in values.items():
+            tests = lag[1] if lag is not None and name == "loop_lag_ms" else shown
+            self.summary.metrics[name].add(value, at, tests)
+
+        if self._file is not None:
+            row = [f"{at:.3f}"] + [
+                "" if values[name] is None else f"{values[name]:.1f}"
+                for name in METRICS
+            ]
+            row += [str(len(running)), ";".join(shown)]
+            self._file.write(",".join(row) + "\n")
+
+    def _run(self) -> None:
+        self._post_probe()
+
+        while not self._stopped.wait(self.interval):
+            self.sample()
+            self._post_probe()
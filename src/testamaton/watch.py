@@ -0,0 +1,434 @@
+import hashlib
+import importlib
+import inspect
+import os
+import sys
+import traceback
+from time import sleep, time
+from types import CodeType, ModuleType
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from testamaton.reporter import console, print_header, print_usage_report
+from testamaton.selection import excluded_by_tags, select_tests
+from testamaton.sessions import Runner
+from testamaton.store import ResultRecorder, ResultStore
+from testamaton.suites import import_suite
+from testamaton.usage import UsageSampler
+
+IGNORED_DIRS = frozenset(
+    {"__pycache__", "node_modules", "site-packages", "venv", "build", "dist"}
+)
+
+
+class ModuleWatcher:
+    """
+    Polls ``.py`` files under ``roots`` for changes.
+
+    Only ``stat`` is called per file and pass, so an idle watcher costs a
+    directory walk every ``interval`` seconds and nothing is read.
+    """
+
+    def __init__(self, roots: Iterable[str], interval: float = 0.5) -> None:
+        self.roots = [os.path.abspath(root) for root in roots]
+        self.interval = interval
+        self.state: Dict[str, Tuple[int, int]] = self._scan()
+
+    def _scan(self) -> Dict[str, Tuple[int, int]]:
+        state: Dict[str, Tuple[int, int]] = {}
+
+        for root in self.roots:
+            for directory, dirnames, filenames in os.walk(root):
+                dirnames[:] = [
+                    name
+                    for name in dirnames
+                    if name not in IGNORED_DIRS and not name.startswith(".")
+                ]
+
+                for filename in filenames:
+                    if not filename.endswith(".py"):
+                        continue
+
+                    path = os.path.join(directory, filename)
+
+                    try:
+                        stat = os.stat(path)
+                    except FileNotFoundError:
+                        continue
+
+                    state[path] = (stat.st_mtime_ns, stat.st_size)
+
+        return state
+
+    def changes(self) -> Set[str]:
+        state = self._scan()
+        changed = {
+            path
+            for path in state.keys() | self.state.keys()
+            if state.get(path) != self.state.get(path)
+        }
+        self.state = state
+        return changed
+
+    def wait(self) -> Set[str]:
+        while True:
+            changed = self.changes()
+
+            if changed:
+                return changed
+
+            sleep(self.interval)
+
+
+def _is_ignored(path: str, root: str) -> bool:
+    """Whether ``path`` lies in a directory ``ModuleWatcher`` does not scan."""
+    directories = os.path.relpath(os.path.dirname(path), root).split(os.sep)
+    return any(
+        name in IGNORED_DIRS or (name.startswith(".") and name != os.curdir)
+        for name in directories
+    )
+
+
+def _is_watched(module: ModuleType, roots: List[str]) -> bool:
+    path = getattr(module, "__file__", None)
+
+    if not path or module.__name__.split(".")[0] == "testamaton":
+        return False
+
+    path = os.path.abspath(path)
+    return any(
+        path.startswith(root + os.sep) and not _is_ignored(path, root)
+        for root in roots
+    )
+
+
+def watched_modules(roots: List[str]) -> Dict[str, ModuleType]:
+    return {
+        name: module
+        for name, module in list(sys.modules.items())
+        if isinstance(module, ModuleType) and _is_watched(module, roots)
+    }
+
+
+def module_imports(module: ModuleType) -> Set[str]:
+    """Names of modules whose objects are bound in ``module``'s namespace."""
+    imports: Set[str] = set()
+
+    for value in vars(module).values():
+        if isinstance(value, ModuleType):
+            imports.add(value.__name__)
+        else:
+            owner = getattr(value, "__module__", None)
+            if isinstance(owner, str):
+                imports.add(owner)
+
+    imports.discard(module.__name__)
+    return imports
+
+
+def reload_order(paths: Set[str], roots: List[str]) -> List[str]:
+    """
+    Modules to reload for the changed ``paths``, dependencies first.
+
+    A module is reloaded when its file changed or when it binds objects of a
+    module that is reloaded, so ``from helpers import f`` picks up the new
+    ``f``. Modules outside ``roots`` (installed dependencies) are never
+    reloaded.
+    """
+    modules = watched_modules(roots)
+    imports = {
+        name: module_imports(module) & modules.keys()
+        for name, module in modules.items()
+    }
+    stale = {
+        name
+        for name, module in modules.items()
+        if os.path.abspath(module.__file__) in paths
+    }
+
+    grown = True
+    while grown:
+        dependents = {name for name, deps in imports.items() if deps & stale}
+        grown = not dependents <= stale
+        stale |= dependents
+
+    order: List[str] = []
+    remaining = set(stale)
+
+    while remaining:
+        ready = sorted(name for name in remaining if not imports[name] & remaining)
+        # Import cycles: reload the rest in name order
+        ready = ready or sorted(remaining)
+        order.extend(ready)
+        remaining.difference_update(ready)
+
+    return order
+
+
+def _code_objects(code: CodeType) -> Iterable[CodeType]:
+    yield code
+
+    for const in code.co_consts:
+        if isinstance(const, CodeType):
+            yield from _code_objects(const)
+
+
+def _source(value: Any) -> str:
+    try:
+        return inspect.getsource(value)
+    except (OSError, TypeError):
+        code = getattr(value, "__code__", None)
+        return repr(code.co_code) if code is not None else repr(value)
+
+
+def dependencies(func: Callable, local: Set[str]) -> Tuple[str, Set[str]]:
+    """
+    Fingerprint of ``func`` and the modules it depends on.
+
+    Functions and classes of ``local`` modules that ``func`` refers to,
+    directly or through each other, are folded into the fingerprint; other
+    modules, and modules referenced as a whole, are reported by name.
+    """
+    func = inspect.unwrap(func)
+    digest = hashlib.sha1()
+    modules: Set[str] = set()
+    seen: Set[int] = set()
+    pending = [func]
+
+    while pending:
+        value = pending.pop()
+
+        if id(value) in seen:
+            continue
+
+        seen.add(id(value))
+        digest.update(_source(value).encode("utf-8"))
+        code = getattr(value, "__code__", None)
+        namespace = getattr(value, "__globals__", {})
+
+        if code is None:
+            continue
+
+        for nested in _code_objects(code):
+            for name in nested.co_names:
+                if name not in namespace:
+                    continue
+
+                target = namespace[name]
+
+                owner = getattr(target, "__module__", None)
+
+                if isinstance(target, ModuleType):
+                    modules.add(target.__name__)
+                elif owner in local and (
+                    inspect.isfunction(target) or inspect.isclass(target)
+                ):
+                    pending.append(target)
+                elif isinstance(owner, str):
+                    modules.add(owner)
+
+    modules.discard(func.__module__)
+    return digest.hexdigest(), modules
+
+
+def _print_error(title: str) -> None:
+    print_header(title, style="bold red")
+    console.print(traceback.format_exc(), style="red", markup=False)
+
+
+class SuiteWatcher:
+    """
+    Reruns the tests of a suite affected by source changes in a warm process.
+
+    The runner session is started once, so the event loop and session
+    fixtures survive between iterations; a session fixture is only torn down
+    and recreated when its own code or a module it uses changed. Resource
+    usage is sampled over the whole session and summarized on exit.
+    """
+
+    def __init__(
+        self,
+        spec: str,
+        roots: Optional[List[str]] = None,
+        interval: float = 0.5,
+        tags: Optional[List[str]] = None,
+        select: Optional[str] = None,
+        names: Optional[List[str]] = None,
+        capture: bool = True,
+        concurrency: int = 1,
+        reruns: int = 0,
+        loop: Optional[str] = None,
+        slow_callback: Optional[float] = None,
+        sample_usage: Optional[str] = None,
+        store: Optional[str] = None,
+    ) -> None:
+        self.module, self.attribute = import_suite(spec)
+        self.roots = [
+            os.path.abspath(root)
+            for root in roots or [os.path.dirname(self.module.__file__)]
+        ]
+        self.watcher = ModuleWatcher(self.roots, interval)
+        self.tags = tags or []
+        self.select = select
+        self.names = names
+        self.testcase = self._testcase()
+        self.recorder = (
+            ResultRecorder(ResultStore(store), self.testcase.label) if store else None
+        )
+        self.sampler = UsageSampler(sample_usage) if sample_usage else None
+        self.runner = Runner(
+            self.testcase.tests,
+            self.testcase,
+            concurrency=concurrency,
+            capture=capture,
+            reruns=reruns,
+            loop_factory=loop,
+            slow_callback=slow_callback,
+            plugins=[plugin for plugin in (self.sampler, self.recorder) if plugin],
+        )
+        self.tests_state: Dict[str, Tuple[str, Set[str]]] = {}
+        self.fixtures_state: Dict[str, Tuple[str, Set[str]]] = {}
+
+    def _testcase(self) -> Any:
+        return getattr(sys.modules[self.module.__name__], self.attribute)
+
+    def _snapshot(
+        self, functions: Dict[str, Callable]
+    ) -> Dict[str, Tuple[str, Set[str]]]:
+        local = watched_modules(self.roots).keys() | {self.module.__name__}
+        return {name: dependencies(func, local) for name, func in functions.items()}
+
+    @staticmethod
+    def _changed(
+        old: Dict[str, Tuple[str, Set[str]]],
+        new: Dict[str, Tuple[str, Set[str]]],
+        reloaded: Set[str],
+    ) -> Set[str]:
+        return {
+            name
+            for name, (fingerprint, modules) in new.items()
+            if name not in old or old[name][0] != fingerprint or modules & reloaded
+        }
+
+    def _fixture_closure(self, func: Callable) -> Set[str]:
+        fixtures = self.runner.fixtures
+        found: Set[str] = set()
+        pending = list(fixtures.requested(func))
+        pending += [
+            name for name, fixture in fixtures.fixtures.items() if fixture.autouse
+        ]
+
+        while pending:
+            name = pending.pop()
+
+            if name in found or name not in fixtures.fixtures:
+                continue
+
+            found.add(name)
+            pending.extend(fixtures.requested(fixtures.fixtures[name].handler))
+
+        return found
+
+    def _reload(self, paths: Set[str]) -> Optional[Set[str]]:
+        order = reload_order(paths, self.roots)
+
+        for name in order:
+            try:
+                importlib.reload(sys.modules[name])
+            except Exception:  # noqa: BLE001 - any error of the edited module
+                _print_error(f"reloading {name} failed")
+                return None
+
+        return set(order)
+
+    def _affected(self, reloaded: Set[str]) -> List[str]:
+        self.testcase = self._testcase()
+        others = reloaded - {self.module.__name__}
+
+        tests_state = self._snapshot(self.testcase.tests)
+        fixtures_state = self._snapshot(
+            {name: fixture.handler for name, fixture in self.testcase.fixtures.items()}
+        )
+        changed_tests = self._changed(self.tests_state, tests_state, others)
+        changed_fixtures = self._changed(self.fixtures_state, fixtures_state, others)
+        changed_fixtures |= self.fixtures_state.keys() - fixtures_state.keys()
+        self.tests_state, self.fixtures_state = tests_state, fixtures_state
+
+        self.runner.replace_fixtures(self.testcase.fixtures, changed_fixtures)
+
+        return [
+            name
+            for name, test in self.testcase.tests.items()
+            if name in changed_tests or self._fixture_closure(test) & changed_fixtures
+        ]
+
+    def _run(self, names: List[str]) -> None:
+        selected = select_tests(
+            self.testcase.tests,
+            self.testcase.tag_index,
+            self.select,
+            self.names,
+            self.testcase.test_order,
+        )
+        names = [name for name in names if name in selected]
+
+        if not names:
+            print_header("no affected tests", style="dim")
+            return
+
+        self.testcase.reset_counters()
+        self.runner.rebind(
+            self.testcase,
+            {name: self.testcase.tests[name] for name in names},
+            excluded_by_tags(self.testcase.tag_index, self.tags),
+        )
+
+        start = time()
+        self.runner.run_tests(names)
+        report = self.testcase._print_summary(len(names), time() - start)
+
+        if self.recorder is not None:
+            self.recorder.report(self.testcase, report)
+
+    def _rerun(self, reloaded: Optional[Set[str]] = None) -> None:
+        """Run the tests affected by ``reloaded``, all of them at first."""
+        try:
+            if reloaded is None:
+                self._run(list(self.testcase.tests))
+            else:
+                self._run(self._affected(reloaded))
+        except Exception:  # noqa: BLE001
+            # A broken edit must not end the resident session
+            _print_error("rerun failed")
+
+    def loop(self) -> None:
+        self.runner.start_session()
+
+        try:
+            self.tests_state = self._snapshot(self.testcase.tests)
+            self.fixtures_state = self._snapshot(
+                {
+                    name: fixture.handler
+                    for name, fixture in self.testcase.fixtures.items()
+                }
+            )
+            self.runner._print_prelude()
+            self._rerun()
+
+            while True:
+                print_header("watching for changes (Ctrl+C to stop)", style="dim")
+                reloaded = self._reload(self.watcher.wait())
+
+                if reloaded is not None:
+                    self._rerun(reloaded)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.runner.finish_session()
+
+            if self.sampler is not None:
+                print_usage_report(self.sampler.summary)
+
+
+def watch(spec: str, **options) -> None:
+    """Run ``spec`` once, then rerun affected tests after every change."""
+    SuiteWatcher(spec, **options).loop()
@@ -0,0 +1,33 @@
+import sys
+from types import ModuleType
+
+from click.testing import CliRunner
+
+from testamaton.cli import main
+
+SUITE = """
+from testamaton.test_case import TestCase
+
+case = TestCase()
+
+
+@case.test()
+def checked():
+    assert {passing}
+"""
+
+
+def run_suite(tmp_path, monkeypatch, passing: bool) -> int:
+    path = tmp_path / "cli_suite.py"
+    path.write_text(SUITE.format(passing=passing))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setitem(sys.modules, "cli_suite", ModuleType("cli_suite"))
+    return CliRunner().invoke(main, [f"{path}:case", "--no-capture"]).exit_code
+
+
+def test_exit_status_is_zero_when_tests_pass(tmp_path, monkeypatch):
+    assert run_suite(tmp_path, monkeypatch, passing=True) == 0
+
+
+def test_exit_status_is_one_when_a_test_fails(tmp_path, monkeypatch):
+    assert run_suite(tmp_path, monkeypatch, passing=False) == 1
@@ -0,0 +1,93 @@
+from array import array
+
+import pytest
+
+from testamaton import exceptions
+from testamaton.diff import (
+    CHUNK,
+    describe_difference,
+    first_difference_buffer,
+    first_difference_mapping,
+    first_difference_sequence,
+    first_not_close,
+)
+from testamaton.test_case import expect_close, expect_equal
+
+
+def test_first_difference_sequence_across_chunks():
+    lhs = list(range(3 * CHUNK))
+    rhs = list(lhs)
+    rhs[2 * CHUNK + 17] = -1
+
+    assert first_difference_sequence(lhs, lhs) is None
+    assert first_difference_sequence(lhs, rhs) == 2 * CHUNK + 17
+    assert first_difference_sequence(lhs, lhs[:100]) == 100
+
+
+def test_first_difference_buffer_same_format():
+    lhs = array("i", range(1000))
+    rhs = array("i", range(1000))
+    rhs[700] = 0
+
+    assert first_difference_buffer(lhs, lhs) is None
+    assert first_difference_buffer(lhs, rhs) == 700
+
+
+def test_first_difference_buffer_compares_mixed_formats_by_value():
+    ints, doubles = array("i", [1, 2, 3]), array("d", [1, 2, 3])
+
+    assert first_difference_buffer(ints, doubles) is None
+    assert first_difference_buffer(array("b", [1, 2, 3]), array("q", [1, 5, 3])) == 1
+
+
+def test_first_difference_mapping():
+    assert first_difference_mapping({"a": 1}, {"a": 1}) is None
+    assert first_difference_mapping({"a": 1, "b": 2}, {"a": 1, "b": 3}) == "b"
+    assert first_difference_mapping({"a": 1}, {"a": 1, "c": 0}) == "c"
+
+
+def test_describe_nested_difference():
+    lhs = {"rows": [[1, 2], [3, 4]]}
+    rhs = {"rows": [[1, 2], [3, 5]]}
+
+    assert describe_difference(lhs, rhs) == (
+        "at key 'rows': at index 1: first difference at index 1 (length 2 vs 2)\n"
+        "  left  [0:2] = [3, 4]\n"
+        "  right [0:2] = [3, 5]"
+    )
+    assert describe_difference({"a": 1}, {}) == "key 'a' only in left (1 vs 0 keys)"
+
+
+def test_describe_container_type_mismatch():
+    lhs = list(range(100))
+
+    assert describe_difference(lhs, tuple(lhs)) == (
+        "container types differ (list vs tuple)"
+    )
+    assert describe_difference([1, 2], (1, 3)).startswith(
+        "container types differ (list vs tuple), first difference at index 1"
+    )
+
+
+def test_window_is_clamped_to_the_sequence():
+    description = describe_difference("abc", "abd")
+
+    assert "[0:3] = 'abc'" in description
+    assert "[0:3] = 'abd'" in description
+
+
+def test_first_not_close():
+    assert first_not_close([1.0, 2.0], [1.0, 2.0 + 1e-12]) is None
+    assert first_not_close([1.0, 2.0], [1.0, 2.1]) == 1
+    assert first_not_close([1.0, 2.0], [1.0, 2.1], abs_tol=0.2) is None
+    assert first_not_close(array("d", [0.0] * 10), array("f", [0.0] * 9)) == 9
+
+
+def test_expect_helpers_raise_with_location():
+    with pytest.raises(exceptions.TestError, match="first difference at index 3"):
+        expect_equal(list(range(10)), [0, 1, 2, 9, 4, 5, 6, 7, 8, 9])
+
+    with pytest.raises(exceptions.TestError, match="index 1"):
+        expect_close([1.0, 2.0], [1.0, 3.0])
+
+    assert expect_close([1.0], [1.0 + 1e-12])
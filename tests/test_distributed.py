@@ -0,0 +1,53 @@
+import runpy
+from pathlib import Path
+
+from testamaton.hooks import Plugin
+
+SUITE = """
+from testamaton.test_case import TestCase
+
+case = TestCase()
+
+
+@case.test()
+def broken():
+    raise ValueError("bad value")
+
+
+@case.test()
+def fine():
+    pass
+"""
+
+
+class Results(Plugin):
+    def __init__(self) -> None:
+        self.results = {}
+
+    def result(self, result) -> None:
+        self.results[result.name] = result
+
+
+def test_raising_test_is_an_error_not_a_crash(tmp_path: Path):
+    path = tmp_path / "suite.py"
+    path.write_text(SUITE)
+    case = runpy.run_path(str(path), run_name="suite")["case"]
+    results = case.plugin(Results())
+
+    case.run_distributed(workers=1, suite=f"{path}:case", capture=False)
+
+    assert (case.passed, case.errors) == (1, 1)
+    assert "ValueError: bad value" in results.results["broken"].output
+    assert "Worker died" not in results.results["broken"].output
+
+
+def test_raising_test_is_reported_by_the_local_runner(tmp_path: Path):
+    path = tmp_path / "suite.py"
+    path.write_text(SUITE)
+    case = runpy.run_path(str(path), run_name="suite")["case"]
+    results = case.plugin(Results())
+
+    case.run(capture=False)
+
+    assert (case.passed, case.errors) == (1, 1)
+    assert "ValueError: bad value" in results.results["broken"].output
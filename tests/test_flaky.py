@@ -0,0 +1,84 @@
+from testamaton import test_case
+from testamaton.files import merge_json, read_json
+from testamaton.flaky import FlakyHistory, history_status
+from testamaton.loops import LOOP_WARNING
+
+
+def test_outcomes_are_windowed_and_classified(tmp_path):
+    history = FlakyHistory(str(tmp_path / "history.json"), window=3)
+
+    for status in ("error", "success", "success", "success", "skip"):
+        history.record("steady", status)
+
+    history.record("rerun", "flaky")
+    history.record("mixed", "success")
+    history.record("mixed", "warning")
+
+    assert history.outcomes == {"steady": "PPP", "rerun": "R", "mixed": "PF"}
+    assert not history.is_flaky("steady")
+    assert history.is_flaky("rerun")
+    assert history.is_flaky("mixed")
+    assert history.order(["rerun", "steady", "mixed", "new"]) == [
+        "steady",
+        "new",
+        "rerun",
+        "mixed",
+    ]
+
+
+def test_loop_warnings_are_recorded_as_passes():
+    assert history_status("warning", LOOP_WARNING) == "success"
+    assert history_status("warning", "QUARANTINED") == "warning"
+    assert history_status("error", "") == "error"
+
+
+def test_concurrent_histories_are_merged_on_save(tmp_path):
+    path = str(tmp_path / "history.json")
+    first, second = FlakyHistory(path), FlakyHistory(path)
+
+    first.record("a", "success")
+    second.record("a", "error")
+    second.record("b", "success")
+    first.save()
+    second.save()
+
+    assert read_json(tmp_path / "history.json") == {"a": "PF", "b": "P"}
+    assert FlakyHistory(path).is_flaky("a")
+
+
+def test_merge_json_creates_and_updates(tmp_path):
+    path = tmp_path / "nested" / "data.json"
+
+    assert merge_json(path, lambda data: data.update(a=1)) == {"a": 1}
+    assert merge_json(path, lambda data: data.update(b=2)) == {"a": 1, "b": 2}
+    assert read_json(tmp_path / "missing.json") == {}
+
+
+def test_rerun_pass_is_flaky_and_recorded(tmp_path):
+    path = tmp_path / "history.json"
+    case = test_case.TestCase()
+    calls = 0
+
+    @case.test()
+    def unstable():
+        nonlocal calls
+        calls += 1
+        assert calls > 1
+
+    case.run(capture=False, reruns=2, history=str(path))
+
+    assert case.flaky == 1
+    assert read_json(path) == {"unstable": "R"}
+
+
+def test_history_is_not_written_by_default(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    case = test_case.TestCase()
+
+    @case.test()
+    def passing():
+        pass
+
+    case.run(capture=False)
+
+    assert not (tmp_path / ".testamaton").exists()
@@ -0,0 +1,104 @@
+import asyncio
+
+import pytest
+
+from testamaton import test_case
+from testamaton.load import LatencyHistogram, run_load
+from testamaton.standard import LoadProfile
+
+
+def test_histogram_is_exact_for_small_values():
+    histogram = LatencyHistogram()
+
+    for value in range(1, 101):
+        histogram.record(value)
+
+    assert histogram.total == 100
+    assert histogram.percentile(50) == 50
+    assert histogram.percentile(99) == 99
+    assert histogram.percentile(100) == 100
+    assert histogram.max == 100
+
+
+def test_histogram_relative_error_is_bounded():
+    histogram = LatencyHistogram(sub_bucket_bits=7)
+    values = [int(1.37**power) for power in range(10, 60)]
+
+    for value in values:
+        histogram.record(value)
+
+    for percent in (10, 50, 90, 99):
+        expected = values[max(1, round(len(values) * percent / 100)) - 1]
+        assert abs(histogram.percentile(percent) - expected) <= expected / 128
+
+
+def test_histogram_clamps_and_handles_empty():
+    histogram = LatencyHistogram(max_value=1000)
+
+    assert histogram.percentile(50) == 0
+
+    histogram.record(-5)
+    histogram.record(10**9)
+
+    assert histogram.percentile(50) == 0
+    assert histogram.max == 1000
+
+
+def test_load_profile_validation():
+    with pytest.raises(ValueError):
+        LoadProfile(concurrency=0, requests=1)
+    with pytest.raises(ValueError):
+        LoadProfile(concurrency=2)
+
+
+def test_run_load_issues_requests_with_bounded_concurrency():
+    active = 0
+    peak = 0
+
+    async def request() -> None:
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.001)
+        active -= 1
+
+    report = asyncio.run(run_load(request, LoadProfile(concurrency=4, requests=40)))
+
+    assert report.total == 40
+    assert report.errors == 0
+    assert peak == 4
+    assert 0 < report.p50 <= report.p90 <= report.p99 <= report.max
+    assert report.rps > 0
+
+
+def test_run_load_counts_errors_and_keeps_the_first():
+    calls = 0
+
+    async def request() -> None:
+        nonlocal calls
+        calls += 1
+        if calls % 2 == 0:
+            raise ValueError(f"call {calls}")
+
+    report = asyncio.run(run_load(request, LoadProfile(requests=10)))
+
+    assert (report.total, report.errors) == (10, 5)
+    assert report.error_rate == 0.5
+    assert report.first_error == "ValueError: call 2"
+
+
+@pytest.mark.parametrize(("max_error_rate", "errors"), [(0.0, 1), (0.6, 0), (None, 0)])
+def test_load_test_fails_on_error_rate(max_error_rate, errors):
+    case = test_case.TestCase()
+    calls = 0
+
+    @case.test(load=LoadProfile(requests=10, max_error_rate=max_error_rate))
+    async def requests():
+        nonlocal calls
+        calls += 1
+        if calls % 2:
+            raise ValueError("refused")
+
+    case.run(capture=False)
+
+    assert case.errors == errors
@@ -0,0 +1,132 @@
+import asyncio
+from time import perf_counter
+from typing import Dict, List
+
+import pytest
+
+from testamaton.scheduling import ResourcePool, normalize_resources, schedule
+
+
+class Tracker:
+    def __init__(self) -> None:
+        self.started: List[str] = []
+        self.running: Dict[str, int] = {}
+        self.peak: Dict[str, int] = {}
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    def item(self, label: str, demands: Dict[str, int], delay: float = 0.001):
+        async def run() -> None:
+            self.started.append(label)
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+            for name, units in demands.items():
+                self.running[name] = self.running.get(name, 0) + units
+                self.peak[name] = max(self.peak.get(name, 0), self.running[name])
+
+            await asyncio.sleep(delay)
+
+            for name, units in demands.items():
+                self.running[name] -= units
+
+            self.in_flight -= 1
+
+        return demands, run
+
+
+def test_normalize_resources():
+    assert normalize_resources(None) == {}
+    assert normalize_resources("db") == {"db": 1}
+    assert normalize_resources(["db", "ports"]) == {"db": 1, "ports": 1}
+    assert normalize_resources({"cpu": 2}) == {"cpu": 2}
+
+
+def test_capacity_and_concurrency_are_respected():
+    tracker = Tracker()
+    items = [tracker.item(f"db{index}", {"db": 1}) for index in range(20)]
+    items += [tracker.item(f"cpu{index}", {"cpu": 2}) for index in range(10)]
+    items += [tracker.item(f"free{index}", {}) for index in range(20)]
+
+    asyncio.run(schedule(items, 6, ResourcePool({"db": 2, "cpu": 3})))
+
+    assert len(tracker.started) == 50
+    assert tracker.peak["db"] == 2
+    assert tracker.peak["cpu"] == 2
+    assert tracker.peak_in_flight <= 6
+
+
+def test_undeclared_group_is_exclusive():
+    tracker = Tracker()
+    items = [tracker.item(str(index), {"lock": 1}) for index in range(5)]
+
+    asyncio.run(schedule(items, 4, ResourcePool({})))
+
+    assert tracker.peak["lock"] == 1
+
+
+def test_waiters_of_a_group_start_in_order():
+    tracker = Tracker()
+    items = [tracker.item(f"db{index}", {"db": 1}) for index in range(10)]
+
+    asyncio.run(schedule(items, 4, ResourcePool({"db": 1})))
+
+    assert tracker.started == [f"db{index}" for index in range(10)]
+
+
+def test_blocked_group_does_not_block_unrelated_items():
+    tracker = Tracker()
+    items = [
+        tracker.item("db0", {"db": 1}, delay=0.05),
+        tracker.item("db1", {"db": 1}),
+        tracker.item("free", {}),
+    ]
+
+    asyncio.run(schedule(items, 4, ResourcePool({"db": 1})))
+
+    assert tracker.started.index("free") < tracker.started.index("db1")
+
+
+def test_later_items_do_not_overtake_a_waiting_item():
+    tracker = Tracker()
+    items = [
+        tracker.item("one", {"cpu": 1}, delay=0.02),
+        tracker.item("wide", {"cpu": 2}),
+        tracker.item("narrow", {"cpu": 1}),
+    ]
+
+    asyncio.run(schedule(items, 4, ResourcePool({"cpu": 2})))
+
+    assert tracker.started == ["one", "wide", "narrow"]
+
+
+def test_failure_cancels_running_items():
+    cancelled = []
+
+    async def fail() -> None:
+        await asyncio.sleep(0.001)
+        raise ValueError("boom")
+
+    async def slow() -> None:
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    with pytest.raises(ValueError):
+        asyncio.run(schedule([({}, fail), ({}, slow)], 2, ResourcePool({})))
+
+    assert cancelled == [True]
+
+
+def test_shared_lock_scales_linearly():
+    async def noop() -> None:
+        pass
+
+    items = [({"lock": 1}, noop) for _ in range(8000)]
+
+    start = perf_counter()
+    asyncio.run(schedule(items, 8, ResourcePool({})))
+
+    assert perf_counter() - start < 5
@@ -0,0 +1,97 @@
+import pytest
+
+from testamaton import exceptions, test_case
+from testamaton.selection import (
+    TagExpression,
+    excluded_by_tags,
+    match_names,
+    select_tests,
+)
+
+INDEX = {
+    "db": {"read", "write", "migrate"},
+    "slow": {"migrate", "report"},
+    "flaky": {"write"},
+}
+UNIVERSE = {"read", "write", "migrate", "report", "plain"}
+
+
+def evaluate(source: str):
+    return TagExpression(source).evaluate(INDEX, UNIVERSE)
+
+
+def test_tag_expression_operators_and_precedence():
+    assert evaluate("db") == {"read", "write", "migrate"}
+    assert evaluate("db and not slow") == {"read", "write"}
+    assert evaluate("not db") == {"report", "plain"}
+    assert evaluate("slow or db and flaky") == {"migrate", "report", "write"}
+    assert evaluate("(slow or db) and not flaky") == {"read", "migrate", "report"}
+    assert evaluate("unknown") == set()
+
+
+@pytest.mark.parametrize("source", ["", "db and", "(db", "db)", "and db", "db db"])
+def test_invalid_tag_expressions(source):
+    with pytest.raises(exceptions.TestValidationError):
+        evaluate(source)
+
+
+def test_match_names_uses_globs_and_substrings():
+    names = ["test_read", "test_write", "bench_read"]
+
+    assert match_names(names, ["read"]) == {"test_read", "bench_read"}
+    assert match_names(names, ["test_*"]) == {"test_read", "test_write"}
+    assert match_names(names, ["bench_?ead", "write"]) == {"bench_read", "test_write"}
+
+
+def test_excluded_by_tags():
+    assert excluded_by_tags(INDEX, ["slow", "flaky"]) == {"migrate", "report", "write"}
+    assert excluded_by_tags(INDEX, ["missing"]) == set()
+
+
+def named(name: str):
+    def func():
+        pass
+
+    func.__name__ = name
+    return func
+
+
+def make_case() -> test_case.TestCase:
+    case = test_case.TestCase()
+
+    for name, tags in [
+        ("first", ["db"]),
+        ("second", ["slow"]),
+        ("third", ["db", "slow"]),
+        ("fourth", []),
+    ]:
+        case.test(tags=tags)(named(name))
+
+    return case
+
+
+def test_select_tests_keeps_registration_order():
+    case = make_case()
+
+    def select(expression=None, names=None):
+        return list(
+            select_tests(case.tests, case.tag_index, expression, names, case.test_order)
+        )
+
+    assert select() == ["first", "second", "third", "fourth"]
+    assert select("slow or db") == ["first", "second", "third"]
+    assert select("db", ["th"]) == ["third"]
+    assert select(names=["*d"]) == ["second", "third"]
+
+
+def test_redecorating_a_test_replaces_its_tags():
+    case = test_case.TestCase()
+    func = named("func")
+
+    case.test(tags=["a"])(func)
+    case.test(tags=["b"])(func)
+
+    assert case.tag_index["a"] == set()
+    assert case.tag_index["b"] == {"func"}
+    assert list(select_tests(case.tests, case.tag_index, "a")) == []
+    assert list(select_tests(case.tests, case.tag_index, "b")) == ["func"]
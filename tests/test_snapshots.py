@@ -0,0 +1,113 @@
+import json
+import runpy
+from pathlib import Path
+
+from testamaton.sessions import Runner
+from testamaton.sources import chunk_item
+
+SOURCES_SUITE = """
+from testamaton.sources import JSONLSource
+from testamaton.test_case import TestCase, assert_snapshot
+
+case = TestCase()
+source = JSONLSource({data!r})
+
+
+@case.test(arguments=source)
+def double(value):
+    assert_snapshot(value * 2)
+    assert_snapshot(value * 3)
+"""
+
+REPEATED_SUITE = """
+from testamaton.test_case import TestCase, assert_snapshot
+
+case = TestCase()
+values = iter({values!r})
+
+
+@case.test(count_of_launchs=2)
+def repeated():
+    assert_snapshot(next(values))
+"""
+
+NAMED_SUITE = """
+from testamaton.test_case import TestCase, assert_snapshot
+
+case = TestCase()
+value = {value!r}
+
+
+@case.test()
+def named():
+    assert_snapshot(value, "result")
+"""
+
+
+def load_suite(tmp_path: Path, source: str, **values) -> dict:
+    path = tmp_path / "suite.py"
+    path.write_text(source.format(**values))
+    return runpy.run_path(str(path), run_name="suite")
+
+
+def index(tmp_path: Path) -> dict:
+    return json.loads((tmp_path / "__snapshots__" / "suite.json").read_text())
+
+
+def jsonl(tmp_path: Path, count: int) -> str:
+    path = tmp_path / "data.jsonl"
+    path.write_text("".join(f"{value}\n" for value in range(count)))
+    return str(path)
+
+
+def test_snapshot_is_stored_then_compared(tmp_path):
+    suite = load_suite(tmp_path, NAMED_SUITE, value={"a": 1})
+    suite["case"].run(capture=False, update_snapshots=False)
+
+    assert suite["case"].passed == 1
+    assert list(index(tmp_path)) == ["named/result"]
+
+    changed = load_suite(tmp_path, NAMED_SUITE, value={"a": 2})
+    changed["case"].run(capture=False, update_snapshots=False)
+
+    assert changed["case"].errors == 1
+
+    changed["case"].run(capture=False, update_snapshots=True)
+
+    assert changed["case"].passed == 1
+
+
+def test_chunks_check_the_snapshots_of_a_full_run(tmp_path):
+    suite = load_suite(tmp_path, SOURCES_SUITE, data=jsonl(tmp_path, 40))
+    case = suite["case"]
+    case.run(capture=False, update_snapshots=False)
+    recorded = index(tmp_path)
+
+    assert case.passed == 1
+    assert len(recorded) == 80
+
+    runner = Runner(case.tests, case, capture=False)
+    runner.start_session()
+
+    try:
+        for start, end in suite["source"].chunks(size=16):
+            runner.run_tests([chunk_item("double", start, end)])
+    finally:
+        runner.finish_session()
+
+    assert case.errors == 0
+    assert index(tmp_path) == recorded
+
+
+def test_repeated_launch_checks_the_first_launch(tmp_path):
+    stable = load_suite(tmp_path, REPEATED_SUITE, values=[1, 1])
+    stable["case"].run(capture=False, update_snapshots=False)
+
+    assert stable["case"].passed == 1
+    assert list(index(tmp_path)) == ["repeated/0"]
+
+    (tmp_path / "__snapshots__" / "suite.json").unlink()
+    changing = load_suite(tmp_path, REPEATED_SUITE, values=[1, 2])
+    changing["case"].run(capture=False, update_snapshots=False)
+
+    assert changing["case"].errors == 1
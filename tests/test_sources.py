@@ -0,0 +1,125 @@
+import pytest
+
+from testamaton import exceptions
+from testamaton.sources import (
+    CSVSource,
+    GeneratorSource,
+    JSONLSource,
+    as_argument_source,
+    chunk_item,
+    keyed_arguments,
+    parse_chunk_item,
+    to_argument,
+)
+from testamaton.standard import Argument
+
+
+def arguments(source):
+    return [(argument.args, argument.kwargs) for argument in source]
+
+
+def test_to_argument():
+    assert to_argument(3).args == [3]
+    assert to_argument([1, 2]).args == [1, 2]
+    assert to_argument({"a": 1}).kwargs == {"a": 1}
+    assert to_argument({"args": [1], "kwargs": {"b": 2}}).kwargs == {"b": 2}
+
+
+def test_chunk_items_round_trip():
+    assert parse_chunk_item(chunk_item("test", 10, 20)) == ("test", 10, 20)
+    assert parse_chunk_item("test") is None
+
+
+def test_jsonl_source_skips_blank_lines(tmp_path):
+    path = tmp_path / "cases.jsonl"
+    path.write_text('[1, 2]\n\n{"a": 3}\n4')
+
+    assert arguments(JSONLSource(str(path))) == [
+        ([1, 2], {}),
+        ([], {"a": 3}),
+        ([4], {}),
+    ]
+
+
+def test_empty_file_has_no_cases_or_chunks(tmp_path):
+    path = tmp_path / "empty.jsonl"
+    path.write_text("")
+
+    assert list(JSONLSource(str(path))) == []
+    assert list(JSONLSource(str(path)).chunks()) == []
+
+
+def test_csv_source_uses_header_and_converters(tmp_path):
+    path = tmp_path / "cases.csv"
+    path.write_text("a,b,name\r\n1,2,x\r\n3,4,y\r\n")
+    source = CSVSource(str(path), converters={"a": int, "b": int})
+
+    assert arguments(source) == [
+        ([], {"a": 1, "b": 2, "name": "x"}),
+        ([], {"a": 3, "b": 4, "name": "y"}),
+    ]
+
+
+@pytest.mark.parametrize("size", [1, 7, 64, 1 << 20])
+def test_chunks_cover_every_line_exactly_once(tmp_path, size):
+    path = tmp_path / "cases.jsonl"
+    path.write_text("".join(f"[{value}]\n" for value in range(100)))
+    source = JSONLSource(str(path))
+
+    chunks = list(source.chunks(size))
+    sliced = [case for start, end in chunks for case in source.slice(start, end)]
+
+    assert [start for start, _ in chunks[1:]] == [end for _, end in chunks[:-1]]
+    assert arguments(sliced) == arguments(source)
+
+
+def test_csv_chunks_skip_the_header(tmp_path):
+    path = tmp_path / "cases.csv"
+    path.write_text("value\n" + "".join(f"{value}\n" for value in range(50)))
+    source = CSVSource(str(path), converters={"value": int})
+
+    sliced = [
+        case.kwargs["value"]
+        for start, end in source.chunks(16)
+        for case in source.slice(start, end)
+    ]
+
+    assert sliced == list(range(50))
+
+
+def test_file_cases_are_keyed_by_offset_in_every_slice(tmp_path):
+    path = tmp_path / "cases.jsonl"
+    path.write_text("".join(f"{value}\n" for value in range(20)))
+    source = JSONLSource(str(path))
+    keys = [key for key, _ in keyed_arguments(source)]
+
+    sliced = [
+        key
+        for start, end in source.chunks(8)
+        for key, _ in keyed_arguments(source.slice(start, end))
+    ]
+
+    assert sliced == keys
+    assert len(set(keys)) == 20
+
+
+def test_callables_become_sources():
+    def generated():
+        yield 1
+        yield [2, 3]
+
+    assert isinstance(as_argument_source(generated), GeneratorSource)
+    assert arguments(as_argument_source(generated)) == [([1], {}), ([2, 3], {})]
+    assert arguments(as_argument_source(lambda: [Argument(args=[4])])) == [([4], {})]
+    assert list(keyed_arguments((Argument(), Argument())))[1][0] == 1
+
+    cases = (Argument(),)
+    assert as_argument_source(cases) is cases
+
+
+def test_generator_object_is_rejected():
+    def generated():
+        yield 1
+
+    with pytest.raises(exceptions.TestValidationError):
+        GeneratorSource(generated())
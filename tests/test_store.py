@@ -0,0 +1,120 @@
+from types import SimpleNamespace
+
+import pytest
+
+from testamaton import test_case
+from testamaton.reporter import TestResult as Result
+from testamaton.store import ResultRecorder, ResultStore, failure_signature
+
+TRACEBACK = """Traceback (most recent call last):
+  File "/src/suite.py", line {line}, in check_total
+    assert total == {value}
+AssertionError: expected {value}, got {got}
+"""
+
+
+def record_run(store: ResultStore, results, label: str = "suite") -> None:
+    recorder = ResultRecorder(store, label)
+    recorder.session_start(None)
+
+    failure = TRACEBACK.format(line=10, value=1, got=2)
+
+    for name, status, duration in results:
+        output = failure if status == "error" else None
+        recorder.result(
+            Result(
+                percent=0,
+                label=name,
+                name=name,
+                status=status,
+                duration=duration,
+                output=output,
+            )
+        )
+
+    errors = sum(1 for _, status, _ in results if status == "error")
+    recorder.report(
+        None,
+        SimpleNamespace(
+            total=len(results),
+            passed=len(results) - errors,
+            errors=errors,
+            warnings=0,
+            skipped=0,
+            flaky=0,
+        ),
+    )
+
+
+def test_failure_signature_ignores_lines_and_values():
+    first = failure_signature(TRACEBACK.format(line=10, value=1, got=2))
+    moved = failure_signature(TRACEBACK.format(line=42, value=7, got=9))
+    other = failure_signature(TRACEBACK.replace("AssertionError", "KeyError"))
+
+    assert first[0] == moved[0]
+    assert first[0] != other[0]
+    assert first[1] == "AssertionError: expected 1, got 2"
+    assert failure_signature(None) == (None, None)
+    assert failure_signature("\n\n") == (None, None)
+
+
+def test_queries_on_a_missing_store_are_empty(tmp_path):
+    store = ResultStore(str(tmp_path / "results.db"))
+
+    assert store.durations() == {}
+    assert store.trends() == []
+    assert not (tmp_path / "results.db").exists()
+
+
+def test_durations_trends_and_failures(tmp_path):
+    store = ResultStore(str(tmp_path / "results.db"))
+
+    for run in range(4):
+        record_run(
+            store,
+            [
+                ("growing", "success", 1.0 + run),
+                ("steady", "success", 1.0),
+                ("broken", "error" if run % 2 else "success", 0.5),
+            ],
+        )
+
+    record_run(store, [("other", "success", 9.0)], label="other")
+
+    assert store.durations(runs=2, label="suite") == pytest.approx(
+        {"growing": 3.5, "steady": 1.0, "broken": 0.5}
+    )
+
+    runs = store.trends(label="suite")
+    assert [run.total for run in runs] == [3, 3, 3, 3]
+    assert [run.errors for run in runs] == [0, 1, 0, 1]
+    assert len(store.trends()) == 5
+
+    (growing,) = store.slowest_growing(label="suite")
+    assert (growing.name, growing.first, growing.last) == ("growing", 1.0, 4.0)
+    assert growing.slope == pytest.approx(1.0)
+
+    (broken,) = store.failure_frequency(label="suite")
+    assert (broken.name, broken.runs, broken.failures) == ("broken", 4, 2)
+    assert broken.rate == 0.5
+    assert broken.message == "AssertionError: expected 1, got 2"
+
+
+def test_run_records_into_the_store(tmp_path):
+    path = str(tmp_path / "results.db")
+    case = test_case.TestCase(label="stored")
+
+    @case.test()
+    def passing():
+        pass
+
+    @case.test()
+    def failing():
+        assert False
+
+    case.run(capture=False, store=path)
+    case.run(capture=False, store=path)
+
+    runs = ResultStore(path).trends(label="stored")
+    assert [(run.total, run.passed, run.errors) for run in runs] == [(2, 1, 1)] * 2
+    assert ResultStore(path).failure_frequency(label="stored")[0].name == "failing"
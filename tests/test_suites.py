@@ -0,0 +1,33 @@
+import sys
+from types import ModuleType
+
+import pytest
+
+from testamaton import exceptions
+from testamaton.suites import import_suite
+
+
+def test_file_suite_is_imported_once_as_a_module(tmp_path, monkeypatch):
+    path = tmp_path / "imported_suite.py"
+    path.write_text("case = object()\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setitem(sys.modules, "imported_suite", ModuleType("imported_suite"))
+
+    module, attribute = import_suite(f"{path}:case")
+    again, _ = import_suite(f"{path}:case")
+
+    assert attribute == "case"
+    assert again is module is sys.modules["imported_suite"]
+    assert module.__name__ != "__main__"
+
+
+def test_module_suite_is_imported_by_name():
+    module, attribute = import_suite("testamaton.suites:import_suite")
+
+    assert getattr(module, attribute) is import_suite
+
+
+@pytest.mark.parametrize("spec", ["suite.py", "suite.py:", ":case"])
+def test_invalid_spec(spec):
+    with pytest.raises(exceptions.TestValidationError):
+        import_suite(spec)
@@ -0,0 +1,85 @@
+import sys
+from pathlib import Path
+from types import ModuleType
+
+from testamaton.watch import ModuleWatcher, SuiteWatcher, reload_order, watched_modules
+
+SUITE = """
+from testamaton.test_case import TestCase
+
+case = TestCase()
+
+
+@case.test()
+def fine():
+    pass
+"""
+
+
+def fake_module(monkeypatch, name: str, path: Path) -> ModuleType:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("")
+    module = ModuleType(name)
+    module.__file__ = str(path)
+    monkeypatch.setitem(sys.modules, name, module)
+    return module
+
+
+def test_installed_and_hidden_directories_are_not_watched(tmp_path, monkeypatch):
+    fake_module(monkeypatch, "watch_local", tmp_path / "pkg" / "local.py")
+    fake_module(monkeypatch, "watch_venv", tmp_path / ".venv" / "lib" / "dep.py")
+    fake_module(
+        monkeypatch, "watch_site", tmp_path / "env" / "site-packages" / "dep.py"
+    )
+
+    watched = watched_modules([str(tmp_path)])
+
+    assert "watch_local" in watched
+    assert "watch_venv" not in watched
+    assert "watch_site" not in watched
+
+
+def test_dependents_are_reloaded_after_their_dependencies(tmp_path, monkeypatch):
+    base = fake_module(monkeypatch, "watch_base", tmp_path / "base.py")
+    user = fake_module(monkeypatch, "watch_user", tmp_path / "user.py")
+    user.helper = base
+    fake_module(monkeypatch, "watch_other", tmp_path / "other.py")
+
+    order = reload_order({str(tmp_path / "base.py")}, [str(tmp_path)])
+
+    assert order == ["watch_base", "watch_user"]
+
+
+def test_module_watcher_reports_changes(tmp_path):
+    path = tmp_path / "module.py"
+    path.write_text("a = 1\n")
+    watcher = ModuleWatcher([str(tmp_path)], interval=0.01)
+
+    assert watcher.changes() == set()
+
+    path.write_text("a = 22\n")
+
+    assert watcher.changes() == {str(path)}
+
+
+def test_rerun_errors_keep_the_watcher_alive(tmp_path, monkeypatch):
+    path = tmp_path / "watched_suite.py"
+    path.write_text(SUITE)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    # Replaced by the imported suite, removed again after the test
+    monkeypatch.setitem(sys.modules, "watched_suite", ModuleType("watched_suite"))
+    watcher = SuiteWatcher(f"{path}:case", capture=False)
+
+    def broken(reloaded):
+        raise ValueError("broken edit")
+
+    monkeypatch.setattr(watcher, "_affected", broken)
+    watcher.runner.start_session()
+
+    try:
+        watcher._rerun({"watched_suite"})
+        watcher._rerun()
+    finally:
+        watcher.runner.finish_session()
+
+    assert watcher.testcase.passed == 1